@@ -1,10 +1,23 @@
+import os
+
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import requests
 import dash
 import dash_bootstrap_components as dbc
 
+from dashboard.figure_cache import WARMUP as WARMUP_FIGURES, figure_cache
+from dashboard.figure_store import ENABLED as FIGURE_STORE_ENABLED, STORE_DIR as FIGURE_STORE_DIR, FigureStore, data_version
+from dashboard.geometry import ARTIFACT_PATH as GEO_ARTIFACT_PATH, load_france_regions, remote_urls as geometry_urls
+from dashboard.hpv import gapminder_iso_map, prepare_hpv_data
+from dashboard.http_cache import ENABLED as COMPRESS_ENABLED, response_compressor
+from dashboard.images import add_cache_headers, build_images, picture
+from dashboard.metrics import ENABLED as METRICS_ENABLED, callback_metrics
+from dashboard.profiling import startup
+from dashboard.refresh import data_refresher
+from dashboard.shared_tables import shared_tables
+from dashboard.sources import DataSource, fetch_remote
+
 # Styles figure1
 virus_animation_style = {
     'main-container': {
@@ -83,10 +96,7 @@ def create_virus_animation():
 
     disease_divs = [
         html.Div([
-            html.Img(
-                src=f"https://raw.githubusercontent.com/badis2203/dash_board_projet_zitouni/main/src/image_dash/{img}",
-                style=virus_animation_style['disease-img']
-            )
+            picture(image_manifest, img, virus_animation_style['disease-img'], alt=disease)
         ], id=f'{disease}-container', style={**virus_animation_style['container-base'], **disease_positions[disease]})
         for disease, img in disease_info
     ]
@@ -96,10 +106,7 @@ def create_virus_animation():
         html.Div([
             # Virus
             html.Div([
-                html.Img(
-                    src="https://raw.githubusercontent.com/badis2203/dash_board_projet_zitouni/main/src/image_dash/1_papilomavirus(1).png",
-                    style=virus_animation_style['virus']
-                )
+                picture(image_manifest, "1_papilomavirus(1).png", virus_animation_style['virus'], alt="HPV")
             ], id='virus-container',
                 style={**virus_animation_style['container-base'], **{'top': '50%', 'left': '50%'}}),
 
@@ -168,66 +175,193 @@ cancer_labels = {
     "anus": "Anal Cancer"
 }
 
-df_list = []
-for cancer in cancers:
-    for metric in metrics:
-        file_path = f"https://raw.githubusercontent.com/badis2203/dash_board_projet_zitouni/main/data/2_cancers/2_{cancer}_{metric}.csv"
-        df = pd.read_csv(file_path)
-        df["Cancer"] = cancer
-        df["Type"] = metric
-        df_list.append(df)
-
-df_cancer = pd.concat(df_list, ignore_index=True)
-df_cancer["ASR (World)"] = pd.to_numeric(df_cancer["ASR (World)"], errors="coerce")
-df_cancer["ASR (World)"].fillna(0, inplace=True)
+# Fichiers du dossier data/ (copie locale d'abord, GitHub en secours, cache Parquet).
+# Seules les colonnes tracées sont lues ; taux en float32 arrondis à la précision affichée.
+cancer_sources = {
+    (cancer, metric): DataSource(f"cancer_{cancer}_{metric}", f"2_cancers/2_{cancer}_{metric}.csv",
+                                 usecols=["Population", "ASR (World)"], dtype={"Population": "object"})
+    for cancer in cancers
+    for metric in metrics
+}
+hpv_source = DataSource("hpv_vaccine", "3_HPV_vaccine_data.csv", sep=";", skiprows=1,
+                        dtype={"Entity": "object", "Code": "object", "Year": "int16",
+                               "_3_b_1__sh_acs_hpv": "float32"})
+intro_source = DataSource("introduction_hpv_vaccine", "introduction_hpv_vaccine.csv",
+                          usecols=["Entity", "Year", "intro__description_hpv__human_papilloma_virus__vaccine"],
+                          dtype={"Entity": "object",
+                                 "intro__description_hpv__human_papilloma_virus__vaccine": "category"})
+# Tables régionales (17 lignes) : les taux restent en float64, car px les recopie dans
+# customdata en float64 et un float32 s'y écrirait 8.699999809265137 au lieu de 8.7
+depistage_source = DataSource("depistage2023", "5_france/depistage2023.csv", sep=",", decimals=1,
+                              dtype={"population": "int32"})
+filles_source = DataSource("couverture_filles",
+                           "6_donnees_vac_pap/6_couverture_vaccinale_2023_filles_nettoye.csv", sep=";",
+                           decimals=1)
+garcons_source = DataSource("couverture_garcons",
+                            "6_donnees_vac_pap/6_couverture_vaccinale_2023_garcons_nettoye.csv", sep=";",
+                            decimals=1)
+
+# Téléchargement concurrent de toutes les entrées distantes, puis parsing ci-dessous
+# (le GeoJSON des régions n'est téléchargé que si l'artefact data/geo/ manque)
+startup.begin("téléchargements distants")
+raw_inputs = fetch_remote(
+    [*cancer_sources.values(), hpv_source, intro_source, depistage_source, filles_source, garcons_source],
+    extra_urls=geometry_urls()
+)
+startup.add(nbytes=sum(len(raw) for raw in raw_inputs.values()))
+
+# Chaque groupe de tables est construit par une fonction à partir du contenu brut de ses
+# sources ({nom: octets}, None pour une lecture locale). Le rafraîchissement en arrière-plan
+# (DASH_REFRESH_SECONDS) ne rappelle que les fonctions des groupes dont une source a changé.
+def build_cancer_tables(raw_inputs):
+    startup.begin("cancers : 16 CSV GCO")
+
+    df_list = []
+    for cancer in cancers:
+        for metric in metrics:
+            df = cancer_sources[(cancer, metric)].load(raw_inputs.get(cancer_sources[(cancer, metric)].name))
+            df["Cancer"] = cancer
+            df["Type"] = metric
+            df_list.append(df)
+            startup.add(nbytes=cancer_sources[(cancer, metric)].last_nbytes, rows=len(df))
+
+    df_cancer = pd.concat(df_list, ignore_index=True)
+    df_cancer["ASR (World)"] = pd.to_numeric(df_cancer["ASR (World)"], errors="coerce").fillna(0).astype("float32")
+    df_cancer = df_cancer.astype({"Population": "category", "Cancer": "category", "Type": "category"})
+
+    # Index (cancer, indicateur) -> lignes prêtes à tracer, construit une seule fois
+    # (tables finales mappées depuis .cache/shared, communes à tous les workers)
+    cancer_slices = {
+        key: shared_tables.share(f"cancer_{key[0]}_{key[1]}", group.reset_index(drop=True))
+        for key, group in df_cancer.groupby(["Cancer", "Type"], sort=False, observed=True)
+    }
+    return {"df_cancer": shared_tables.share("cancer", df_cancer), "cancer_slices": cancer_slices}
 
 # Figure3
-df_hpv = pd.read_csv("https://raw.githubusercontent.com/badis2203/dash_board_projet_zitouni/main/data/3_HPV_vaccine_data.csv", sep=";",
-                     skiprows=1)
+startup.begin("HPV : codes ISO gapminder")
+iso_map = gapminder_iso_map()
+
+default_hpv_year = 2022
+hpv_map_title = "HPV Vaccination Rates for Girls (Year {year})"
+
+def create_timeline_figure(hpv_trend, year):
+    fig = px.line(
+        hpv_trend,
+        x='Year',
+        y='_3_b_1__sh_acs_hpv',
+        title="Global HPV Vaccination Rate Trends",
+        labels={"_3_b_1__sh_acs_hpv": "Vaccination Rate (%)", "Year": "Year"},
+        markers=True
+    )
+
+    fig.add_vline(x=year, line_dash="dash", line_color="red")
+
+    fig.update_layout(
+        margin={"r": 15, "t": 30, "l": 15, "b": 10},
+    )
+
+    return fig
+
+def build_hpv_tables(raw_inputs):
+    startup.begin("HPV : lecture OWID")
+    df_hpv = hpv_source.load(raw_inputs.get(hpv_source.name))
+    startup.add(nbytes=hpv_source.last_nbytes, rows=len(df_hpv))
 
-iso_map = px.data.gapminder()[['country', 'iso_alpha']].drop_duplicates()
-iso_map = dict(zip(iso_map.country, iso_map.iso_alpha))
+    startup.begin("HPV : prepare_hpv_data")
+    df_hpv = shared_tables.share("hpv", prepare_hpv_data(df_hpv, iso_map))
+    startup.add(rows=len(df_hpv))
+
+    # Courbe de tendance mondiale : calculée une seule fois, seule la ligne de l'année bouge
+    startup.begin("HPV : frise et valeurs par année")
+    hpv_trend = df_hpv.groupby('Year')['_3_b_1__sh_acs_hpv'].mean().reset_index()
+
+    # Animation côté navigateur : valeurs de chaque année, dans l'ordre des pays de la carte
+    hpv_frames = {
+        'years': [int(year) for year in sorted(df_hpv['Year'].unique())],
+        'z': {str(year): group['_3_b_1__sh_acs_hpv'].tolist() for year, group in df_hpv.groupby('Year')},
+        'title': hpv_map_title
+    }
+    return {"df_hpv": df_hpv, "hpv_trend": hpv_trend, "hpv_frames": hpv_frames,
+            "timeline_figure": create_timeline_figure(hpv_trend, default_hpv_year)}
+
+@figure_cache.memoize("hpv_map_figure", version=data_refresher.version("hpv"),
+                      inputs=lambda: [(int(year),) for year in sorted(data_refresher.current().df_hpv['Year'].unique())])
+def create_hpv_map_figure(year):
+    df_hpv = data_refresher.current().df_hpv
+    df_filtered = df_hpv[df_hpv['Year'] == year]
+
+    if df_filtered.empty:
+        return px.choropleth(title=f"No data available for Year {year}")
+
+    # Création du graphique 3
+    fig = px.choropleth(
+        df_filtered,
+        locations="Code",
+        color="_3_b_1__sh_acs_hpv",
+        hover_name="Entity",
+        hover_data={"_3_b_1__sh_acs_hpv": True, "Code": False},
+        labels={"_3_b_1__sh_acs_hpv": "Vaccination Rate (%)"},
+        title=hpv_map_title.format(year=year),
+        color_continuous_scale="Blues",
+        range_color=[0, 100]
+
+    )
+
+    fig.update_geos(
+        showcoastlines=True,
+        coastlinecolor="Black",
+        showland=True,
+        landcolor="lightgray",
+        projection_type="mercator",
+        lonaxis=dict(showgrid=False, range=[-180, 180]),
+        lataxis=dict(showgrid=False, range=[-35, 90])
+    )
 
-def prepare_hpv_data(df):
-    all_countries = pd.DataFrame({
-        'Entity': list(iso_map.keys()),
-        'Code': list(iso_map.values())
-    })
-    years = df['Year'].unique()
-    complete_data = []
+    fig.update_traces(
+        hovertemplate="<b>%{hovertext}</b><br>" +
+                      "Vaccination Rate: %{z:.1f}%<extra></extra>"
+    )
 
-    for year in years:
-        year_data = df[df['Year'] == year].copy()
-        merged = all_countries.merge(year_data, on=['Entity', 'Code'], how='left')
-        merged['Year'] = year
-        merged['_3_b_1__sh_acs_hpv'] = merged['_3_b_1__sh_acs_hpv'].fillna(0)
-        complete_data.append(merged)
+    fig.update_layout(
+        margin={"r": 20, "t": 30, "l": 20, "b": 20},
+        paper_bgcolor='white',
+        geo=dict(
+            bgcolor='white'
+    ))
 
-    return pd.concat(complete_data, ignore_index=True)
+    return fig
 
-df_hpv = prepare_hpv_data(df_hpv)
+# Animation côté navigateur (DASH_HPV_ANIMATION=client, par défaut) : carte de départ et
+# valeurs de chaque année (hpv_frames) envoyées une seule fois avec la page
+HPV_ANIMATION = os.environ.get("DASH_HPV_ANIMATION", "client")
 
 # Figure4
-df_intro = pd.read_csv('https://raw.githubusercontent.com/badis2203/dash_board_projet_zitouni/main/data/introduction_hpv_vaccine.csv')
-filtered_df_intro = df_intro[df_intro['intro__description_hpv__human_papilloma_virus__vaccine'] == 'Entire country']
-filtered_df_intro.loc[:, 'Year'] = pd.to_numeric(filtered_df_intro['Year'], errors='coerce')
-filtered_df_intro = filtered_df_intro.sort_values(by='Year')
-
-countries_by_year = {}
-for year in filtered_df_intro['Year'].unique():
-    countries_by_year[year] = set(filtered_df_intro[filtered_df_intro['Year'] == year]['Entity'])
-
-new_countries_by_year = {}
-cumulative_countries = set()
-cumulative_counts = []
-for year in sorted(countries_by_year.keys()):
-    new_countries_by_year[year] = countries_by_year[year] - cumulative_countries
-    cumulative_countries.update(countries_by_year[year])
-    cumulative_counts.append((year, len(cumulative_countries)))
-
-cumulative_df = pd.DataFrame(cumulative_counts, columns=['Year', 'Total_Countries'])
-min_year, max_year = cumulative_df['Year'].min(), cumulative_df['Year'].max()
-country_options = [{'label': country, 'value': country} for country in sorted(filtered_df_intro['Entity'].unique())]
+def build_intro_tables(raw_inputs):
+    startup.begin("introduction du vaccin")
+    df_intro = intro_source.load(raw_inputs.get(intro_source.name))
+    startup.add(nbytes=intro_source.last_nbytes, rows=len(df_intro))
+    filtered_df_intro = df_intro[df_intro['intro__description_hpv__human_papilloma_virus__vaccine'] == 'Entire country']
+    filtered_df_intro.loc[:, 'Year'] = pd.to_numeric(filtered_df_intro['Year'], errors='coerce')
+    filtered_df_intro = shared_tables.share("intro", filtered_df_intro.sort_values(by='Year'))
+
+    countries_by_year = {}
+    for year in filtered_df_intro['Year'].unique():
+        countries_by_year[year] = set(filtered_df_intro[filtered_df_intro['Year'] == year]['Entity'])
+
+    new_countries_by_year = {}
+    cumulative_countries = set()
+    cumulative_counts = []
+    for year in sorted(countries_by_year.keys()):
+        new_countries_by_year[year] = countries_by_year[year] - cumulative_countries
+        cumulative_countries.update(countries_by_year[year])
+        cumulative_counts.append((year, len(cumulative_countries)))
+
+    cumulative_df = pd.DataFrame(cumulative_counts, columns=['Year', 'Total_Countries'])
+    min_year, max_year = cumulative_df['Year'].min(), cumulative_df['Year'].max()
+    country_options = [{'label': country, 'value': country} for country in sorted(filtered_df_intro['Entity'].unique())]
+    return {"filtered_df_intro": filtered_df_intro, "new_countries_by_year": new_countries_by_year,
+            "cumulative_df": cumulative_df, "min_year": min_year, "max_year": max_year,
+            "country_options": country_options}
 
 def create_layout(year_slider_id):
     return html.Div([
@@ -236,553 +370,418 @@ def create_layout(year_slider_id):
     ])
 
 # Figure5
-file_path_depistage = "https://raw.githubusercontent.com/badis2203/dash_board_projet_zitouni/main/data/5_france/depistage2023.csv"
-df_depistage = pd.read_csv(file_path_depistage, sep=",")
-
-df_depistage.columns = ['code_region', 'libelle_region', 'population', 'incidence', 'depistage_global',
-                         'depistage_vingtaine', 'trentaine_trancheA', 'trentaine_trancheB',
-                         'quarantaine_trancheA', 'quarantaine_trancheB', 'cinquantaine_trancheA',
-                         'cinquantaine_trancheB', 'soixantaine']
-
-corrections_regions = {
-     "Paca": "Provence-Alpes-Côte d'Azur",
-    "Ile de France": "Île-de-France",
-    "Grand-Est": "Grand Est",
-    "Bourgogne et Franche-Comté": "Bourgogne-Franche-Comté",
-    "Centre": "Centre-Val de Loire",
-    "Nouvelle Aquitaine": "Nouvelle-Aquitaine",
-    "Auvergne et Rhône-Alpes": "Auvergne-Rhône-Alpes",
-    "Corse": "Corse"
-}
+def build_depistage_tables(raw_inputs):
+    startup.begin("dépistage par région")
+    df_depistage = depistage_source.load(raw_inputs.get(depistage_source.name))
+    startup.add(nbytes=depistage_source.last_nbytes, rows=len(df_depistage))
+
+    df_depistage.columns = ['code_region', 'libelle_region', 'population', 'incidence', 'depistage_global',
+                             'depistage_vingtaine', 'trentaine_trancheA', 'trentaine_trancheB',
+                             'quarantaine_trancheA', 'quarantaine_trancheB', 'cinquantaine_trancheA',
+                             'cinquantaine_trancheB', 'soixantaine']
+
+    corrections_regions = {
+         "Paca": "Provence-Alpes-Côte d'Azur",
+        "Ile de France": "Île-de-France",
+        "Grand-Est": "Grand Est",
+        "Bourgogne et Franche-Comté": "Bourgogne-Franche-Comté",
+        "Centre": "Centre-Val de Loire",
+        "Nouvelle Aquitaine": "Nouvelle-Aquitaine",
+        "Auvergne et Rhône-Alpes": "Auvergne-Rhône-Alpes",
+        "Corse": "Corse"
+    }
 
-df_depistage['libelle_region'] = df_depistage['libelle_region'].replace(corrections_regions)
-
-geojson_url = "https://france-geojson.gregoiredavid.fr/repo/regions.geojson"
-geojson_data = requests.get(geojson_url).json()
-
-def translate_geometry(geometry, delta_lon, delta_lat):
-    if geometry["type"] == "Polygon":
-        new_coords = []
-        for ring in geometry["coordinates"]:
-            new_coords.append([[lon + delta_lon, lat + delta_lat] for lon, lat in ring])
-        geometry["coordinates"] = new_coords
-    elif geometry["type"] == "MultiPolygon":
-        new_coords = []
-        for polygon in geometry["coordinates"]:
-            new_polygon = []
-            for ring in polygon:
-                new_polygon.append([[lon + delta_lon, lat + delta_lat] for lon, lat in ring])
-            new_coords.append(new_polygon)
-        geometry["coordinates"] = new_coords
-    return geometry
-
-def scale_geometry(geometry, scale_factor, center_lon, center_lat):
-    if geometry["type"] == "Polygon":
-        new_coords = []
-        for ring in geometry["coordinates"]:
-            new_coords.append([[(lon - center_lon) * scale_factor + center_lon,
-                                (lat - center_lat) * scale_factor + center_lat]
-                               for lon, lat in ring])
-        geometry["coordinates"] = new_coords
-    elif geometry["type"] == "MultiPolygon":
-        new_coords = []
-        for polygon in geometry["coordinates"]:
-            new_polygon = []
-            for ring in polygon:
-                new_polygon.append([[(lon - center_lon) * scale_factor + center_lon,
-                                     (lat - center_lat) * scale_factor + center_lat]
-                                    for lon, lat in ring])
-            new_coords.append(new_polygon)
-        geometry["coordinates"] = new_coords
-    return geometry
-
-def compute_bounding_box(geometry):
-    lons, lats = [], []
-    if geometry["type"] == "Polygon":
-        for ring in geometry["coordinates"]:
-            for lon, lat in ring:
-                lons.append(lon)
-                lats.append(lat)
-    elif geometry["type"] == "MultiPolygon":
-        for polygon in geometry["coordinates"]:
-            for ring in polygon:
-                for lon, lat in ring:
-                    lons.append(lon)
-                    lats.append(lat)
-    return min(lons), max(lons), min(lats), max(lats)
-
-def scale_and_translate_geometry(geometry, target_dim, target_position):
-    min_lon, max_lon, min_lat, max_lat = compute_bounding_box(geometry)
-    center_lon = (min_lon + max_lon) / 2
-    center_lat = (min_lat + max_lat) / 2
-
-    current_dim = max(max_lon - min_lon, max_lat - min_lat)
-    scale_factor = target_dim / current_dim if current_dim else 1
-
-    scaled_geo = scale_geometry(geometry, scale_factor, center_lon, center_lat)
-    min_lon2, max_lon2, min_lat2, max_lat2 = compute_bounding_box(scaled_geo)
-    new_center_lon = (min_lon2 + max_lon2) / 2
-    new_center_lat = (min_lat2 + max_lat2) / 2
-
-    delta_lon = target_position[0] - new_center_lon
-    delta_lat = target_position[1] - new_center_lat
-    return translate_geometry(scaled_geo, delta_lon, delta_lat)
-
-target_positions = {
-    "Guadeloupe": (-8, 49),
-    "Martinique": (-8, 47),
-    "Guyane": (-8, 45),
-    "La Réunion": (-8, 43),
-    "Mayotte": (-8, 41)
-}
-target_dim = 2.0
+    df_depistage['libelle_region'] = df_depistage['libelle_region'].replace(corrections_regions)
+    return {"df_depistage": shared_tables.share("depistage", df_depistage)}
 
-for feature in geojson_data["features"]:
-    name = feature["properties"]["nom"]
-    if name in target_positions:
-        feature["geometry"] = scale_and_translate_geometry(feature["geometry"],
-                                                            target_dim,
-                                                            target_positions[name])
+# Géométrie des régions (encarts DOM-TOM), partagée par les deux cartes de la France
+startup.begin("géométrie des régions")
+geojson_data = load_france_regions(raw_inputs.get("regions_geojson"))
+startup.add(nbytes=os.path.getsize(GEO_ARTIFACT_PATH), rows=len(geojson_data["features"]))
 
 
 # Figure6
+def build_couverture_tables(raw_inputs):
+    startup.begin("couverture vaccinale France")
+    df_filles = filles_source.load(raw_inputs.get(filles_source.name))
+    df_garcons = garcons_source.load(raw_inputs.get(garcons_source.name))
+    startup.add(nbytes=filles_source.last_nbytes + garcons_source.last_nbytes,
+                rows=len(df_filles) + len(df_garcons))
+
+    for df in [df_filles, df_garcons]:
+        if "Année de\nnaissance" in df.columns:
+            df.rename(columns={"Année de\nnaissance": "Région"}, inplace=True)
+
+    corrections_regions = {
+        "Paca": "Provence-Alpes-Côte d'Azur",
+        "Ile de France": "Île-de-France",
+        "Grand-Est": "Grand Est",
+        "Bourgogne - Franche - Comté": "Bourgogne-Franche-Comté",
+        "Centre": "Centre-Val de Loire",
+        "Nouvelle Aquitaine": "Nouvelle-Aquitaine",
+        "Auvergne - Rhône-Alpes": "Auvergne-Rhône-Alpes"
+    }
+    for df in [df_filles, df_garcons]:
+        df["Région"] = df["Région"].replace(corrections_regions)
+
+    df_filles_melted = df_filles.melt(id_vars=["Région"], var_name="Année", value_name="Vaccination Coverage")
+    df_garcons_melted = df_garcons.melt(id_vars=["Région"], var_name="Année", value_name="Vaccination Coverage")
+
+    for df_melt in [df_filles_melted, df_garcons_melted]:
+        # Convert the year to an integer and add 16
+        df_melt["Année"] = (df_melt["Année"].astype(int) + 16).astype("int16")
+        df_melt["Région"] = df_melt["Région"].astype("category")
+        df_melt["Vaccination Coverage"] = df_melt["Vaccination Coverage"].astype("float32")
+
+    return {
+        "df_filles": shared_tables.share("couverture_filles", df_filles),
+        "df_garcons": shared_tables.share("couverture_garcons", df_garcons),
+        "df_filles_melted": shared_tables.share("couverture_filles_melted", df_filles_melted),
+        "df_garcons_melted": shared_tables.share("couverture_garcons_melted", df_garcons_melted),
+    }
 
-file_path_filles = "https://raw.githubusercontent.com/badis2203/dash_board_projet_zitouni/main/data/6_donnees_vac_pap/6_couverture_vaccinale_2023_filles_nettoye.csv"
-file_path_garcons = "https://raw.githubusercontent.com/badis2203/dash_board_projet_zitouni/main/data/6_donnees_vac_pap/6_couverture_vaccinale_2023_garcons_nettoye.csv"
-
-df_filles = pd.read_csv(file_path_filles, sep=";")
-df_garcons = pd.read_csv(file_path_garcons, sep=";")
-
-for df in [df_filles, df_garcons]:
-    if "Année de\nnaissance" in df.columns:
-        df.rename(columns={"Année de\nnaissance": "Région"}, inplace=True)
-
-corrections_regions = {
-    "Paca": "Provence-Alpes-Côte d'Azur",
-    "Ile de France": "Île-de-France",
-    "Grand-Est": "Grand Est",
-    "Bourgogne - Franche - Comté": "Bourgogne-Franche-Comté",
-    "Centre": "Centre-Val de Loire",
-    "Nouvelle Aquitaine": "Nouvelle-Aquitaine",
-    "Auvergne - Rhône-Alpes": "Auvergne-Rhône-Alpes"
-}
-for df in [df_filles, df_garcons]:
-    df["Région"] = df["Région"].replace(corrections_regions)
-
-geojson_url = "https://france-geojson.gregoiredavid.fr/repo/regions.geojson"
-geojson_data = requests.get(geojson_url).json()
-
-def translate_geometry(geometry, delta_lon, delta_lat):
-    if geometry["type"] == "Polygon":
-        new_coords = []
-        for ring in geometry["coordinates"]:
-            new_ring = [[lon + delta_lon, lat + delta_lat] for lon, lat in ring]
-            new_coords.append(new_ring)
-        geometry["coordinates"] = new_coords
-    elif geometry["type"] == "MultiPolygon":
-        new_coords = []
-        for polygon in geometry["coordinates"]:
-            new_polygon = []
-            for ring in polygon:
-                new_ring = [[lon + delta_lon, lat + delta_lat] for lon, lat in ring]
-                new_polygon.append(new_ring)
-            new_coords.append(new_polygon)
-        geometry["coordinates"] = new_coords
-    return geometry
-
-def scale_geometry(geometry, scale_factor, center_lon, center_lat):
-    if geometry["type"] == "Polygon":
-        new_coords = []
-        for ring in geometry["coordinates"]:
-            new_ring = []
-            for lon, lat in ring:
-                scaled_lon = (lon - center_lon) * scale_factor + center_lon
-                scaled_lat = (lat - center_lat) * scale_factor + center_lat
-                new_ring.append([scaled_lon, scaled_lat])
-            new_coords.append(new_ring)
-        geometry["coordinates"] = new_coords
-    elif geometry["type"] == "MultiPolygon":
-        new_coords = []
-        for polygon in geometry["coordinates"]:
-            new_polygon = []
-            for ring in polygon:
-                new_ring = []
-                for lon, lat in ring:
-                    scaled_lon = (lon - center_lon) * scale_factor + center_lon
-                    scaled_lat = (lat - center_lat) * scale_factor + center_lat
-                    new_ring.append([scaled_lon, scaled_lat])
-                new_polygon.append(new_ring)
-            new_coords.append(new_polygon)
-        geometry["coordinates"] = new_coords
-    return geometry
-
-def compute_bounding_box(geometry):
-    lons, lats = [], []
-    if geometry["type"] == "Polygon":
-        for ring in geometry["coordinates"]:
-            for lon, lat in ring:
-                lons.append(lon)
-                lats.append(lat)
-    elif geometry["type"] == "MultiPolygon":
-        for polygon in geometry["coordinates"]:
-            for ring in polygon:
-                for lon, lat in ring:
-                    lons.append(lon)
-                    lats.append(lat)
-    return min(lons), max(lons), min(lats), max(lats)
-
-def scale_and_translate_geometry(geometry, target_dim, target_position):
-    min_lon, max_lon, min_lat, max_lat = compute_bounding_box(geometry)
-    center_lon = (min_lon + max_lon) / 2
-    center_lat = (min_lat + max_lat) / 2
-
-    current_max_dim = max(max_lon - min_lon, max_lat - min_lat)
-    scale_factor = target_dim / current_max_dim if current_max_dim else 1
-
-    scaled_geometry = scale_geometry(geometry, scale_factor, center_lon, center_lat)
-    min_lon2, max_lon2, min_lat2, max_lat2 = compute_bounding_box(scaled_geometry)
-    new_center_lon = (min_lon2 + max_lon2) / 2
-    new_center_lat = (min_lat2 + max_lat2) / 2
-
-    delta_lon = target_position[0] - new_center_lon
-    delta_lat = target_position[1] - new_center_lat
-    final_geometry = translate_geometry(scaled_geometry, delta_lon, delta_lat)
-    return final_geometry
-
-target_positions = {
-    "Guadeloupe": (-8, 49),
-    "Martinique": (-8, 47),
-    "Guyane": (-8, 45),
-    "La Réunion": (-8, 43),
-    "Mayotte": (-8, 41)
-}
-target_dim = 2.0
+# Premier snapshot des données, construit au démarrage (avant le fork des workers gunicorn)
+data_refresher.add_group("cancer", cancer_sources.values(), build_cancer_tables)
+data_refresher.add_group("hpv", [hpv_source], build_hpv_tables)
+data_refresher.add_group("intro", [intro_source], build_intro_tables)
+data_refresher.add_group("depistage", [depistage_source], build_depistage_tables)
+data_refresher.add_group("couverture", [filles_source, garcons_source], build_couverture_tables)
+data_refresher.load(raw_inputs)
 
-for feature in geojson_data["features"]:
-    name = feature["properties"]["nom"]
-    if name in target_positions:
-        feature["geometry"] = scale_and_translate_geometry(
-            feature["geometry"],
-            target_dim=target_dim,
-            target_position=target_positions[name]
-        )
+# APP DASH --------------------------------------------------------------------------
+# Images de l'animation : variantes AVIF / WebP / PNG à la taille d'affichage dans assets/img/
+startup.begin("images de l'animation")
+image_manifest = build_images()
 
+startup.begin("Dash : application, layout, callbacks")
+app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
+# Application WSGI pour la production : gunicorn -c gunicorn.conf.py app:server
+server = app.server
+add_cache_headers(server)
 
-df_filles_melted = df_filles.melt(id_vars=["Région"], var_name="Année", value_name="Vaccination Coverage")
-df_garcons_melted = df_garcons.melt(id_vars=["Région"], var_name="Année", value_name="Vaccination Coverage")
+# Latence, taille des réponses et erreurs de chaque callback, exposées sur /metrics
+if METRICS_ENABLED:
+    callback_metrics.instrument(app)
 
-for df_melt in [df_filles_melted, df_garcons_melted]:
-    # Convert the year to an integer and add 16
-    df_melt["Année"] = df_melt["Année"].astype(int) + 16
+# Compression brotli / gzip et ETags des réponses JSON (après les mesures de taille)
+if COMPRESS_ENABLED:
+    response_compressor.instrument(server)
 
-# APP DASH --------------------------------------------------------------------------
-app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
+# Revalidation périodique des sources (DASH_REFRESH_SECONDS), un thread par process
+data_refresher.instrument(server)
 
 # Layout de l'application
 import dash
-from dash import dcc, html
+from dash import dcc, html, Patch
 import dash_bootstrap_components as dbc
 import plotly.express as px
 import pandas as pd
 from dash.dependencies import Input, Output, State
 from dash import callback_context
 import os
-app.layout = html.Div([
-    # Colonne gauche (12%)
-    html.Div([
-        html.Ul([
-            html.Li(html.A("CANCERS", href="#monde", className='nav-link',
-                           **{'data-scroll': 'true'}, style={
-                    'color': '#d6e1e7',
-                    'textDecoration': 'none',
-                    'fontSize': '120%',
-                    'padding': '10px',
-                    'display': 'block',
-                    'cursor': 'pointer',
-                    'whiteSpace': 'normal',
-                    'wordWrap': 'break-word',
-                    'overflowWrap': 'break-word',
-                })),
-            html.Hr(style={'width': '75%', 'margin': '10px auto', 'border': '1.5px solid #d6e1e7'}),
-
-            html.Li(html.A("VACCINE", href="#vaccination", className='nav-link',
-                           **{'data-scroll': 'true'}, style={
-                    'color': '#d6e1e7',
-                    'textDecoration': 'none',
-                    'fontSize': '120%',
-                    'padding': '10px',
-                    'display': 'block',
-                    'cursor': 'pointer',
-                    'whiteSpace': 'normal',
-                    'wordWrap': 'break-word',
-                    'overflowWrap': 'break-word',
-                })),
-            html.Hr(style={'width': '75%', 'margin': '10px auto', 'border': '1.5px solid #d6e1e7'}),
-
-            html.Li(html.A("ZOOM FRANCE", href="#zoom_france", className='nav-link',
-                           **{'data-scroll': 'true'}, style={
-                    'color': '#d6e1e7',
-                    'textDecoration': 'none',
-                    'fontSize': '120%',
-                    'padding': '10px',
-                    'display': 'block',
-                    'cursor': 'pointer',
-                    'whiteSpace': 'normal',
-                    'wordWrap': 'break-word',
-                    'overflowWrap': 'break-word',
-                })),
-        ], style={
-            "listStyleType": "none",
-            "padding": "0",
-            "textAlign": "center",
-            'marginTop': '12vh'
-        })
-    ], style={
-        'width': '12%',
-        'padding': '20px',
-        'backgroundColor': '#457b9a',
-        'height': '100vh',
-        'position': 'fixed',
-        'top': '0',
-        'left': '0',
-        'zIndex': '1000',
-        'overflowY': 'auto'
-    }),
-
-    html.Div([
-        # Colonne de droite (88%) - Contenu principal
+def serve_layout():
+    # Appelé à chaque chargement de page : options, curseurs et valeurs de l'animation
+    # viennent du snapshot de données courant (rafraîchi sans redémarrage)
+    data = data_refresher.current()
+    return html.Div([
+        # Colonne gauche (12%)
         html.Div([
-                html.H1("HPV Vaccination : A Global Public Health Challenge", className='dashboard-title',
-                        style={'color': '#d6e1e7'})
+            html.Ul([
+                html.Li(html.A("CANCERS", href="#monde", className='nav-link',
+                               **{'data-scroll': 'true'}, style={
+                        'color': '#d6e1e7',
+                        'textDecoration': 'none',
+                        'fontSize': '120%',
+                        'padding': '10px',
+                        'display': 'block',
+                        'cursor': 'pointer',
+                        'whiteSpace': 'normal',
+                        'wordWrap': 'break-word',
+                        'overflowWrap': 'break-word',
+                    })),
+                html.Hr(style={'width': '75%', 'margin': '10px auto', 'border': '1.5px solid #d6e1e7'}),
+
+                html.Li(html.A("VACCINE", href="#vaccination", className='nav-link',
+                               **{'data-scroll': 'true'}, style={
+                        'color': '#d6e1e7',
+                        'textDecoration': 'none',
+                        'fontSize': '120%',
+                        'padding': '10px',
+                        'display': 'block',
+                        'cursor': 'pointer',
+                        'whiteSpace': 'normal',
+                        'wordWrap': 'break-word',
+                        'overflowWrap': 'break-word',
+                    })),
+                html.Hr(style={'width': '75%', 'margin': '10px auto', 'border': '1.5px solid #d6e1e7'}),
+
+                html.Li(html.A("ZOOM FRANCE", href="#zoom_france", className='nav-link',
+                               **{'data-scroll': 'true'}, style={
+                        'color': '#d6e1e7',
+                        'textDecoration': 'none',
+                        'fontSize': '120%',
+                        'padding': '10px',
+                        'display': 'block',
+                        'cursor': 'pointer',
+                        'whiteSpace': 'normal',
+                        'wordWrap': 'break-word',
+                        'overflowWrap': 'break-word',
+                    })),
             ], style={
-                'top': 0,
-                'backgroundColor': '#457b9a',
-                'zIndex': 1000,
-                'height': '45vh',
+                "listStyleType": "none",
+                "padding": "0",
                 "textAlign": "center",
-                'fontSize':'50px'
-            }),
+                'marginTop': '12vh'
+            })
+        ], style={
+            'width': '12%',
+            'padding': '20px',
+            'backgroundColor': '#457b9a',
+            'height': '100vh',
+            'position': 'fixed',
+            'top': '0',
+            'left': '0',
+            'zIndex': '1000',
+            'overflowY': 'auto'
+        }),
 
         html.Div([
-                # Première ligne de graphiques -----
-                html.Section([
-                    html.Div([
-                        html.H2("Human papilllomavirus-related cancers", style={"textAlign": "center",'fontSize':'27px','color':'#0c425a'}),
-                        html.Div(className='row-fixed', children=[create_virus_animation()],
-                                 style={'height': '100%'}),
-
-                    html.P(
-                        "Click on a organ to see the attribution rate.",
-                        style={
-                            'textAlign': 'center',
-                            'marginTop': '10px',
-                            'fontSize': '14px',
-                            'color': '#666'
-                        }
-                    ),
-                    ], style={'width': '35%', 'padding': '10px', 'display': 'flex', 'flexDirection': 'column'}),
+            # Colonne de droite (88%) - Contenu principal
+            html.Div([
+                    html.H1("HPV Vaccination : A Global Public Health Challenge", className='dashboard-title',
+                            style={'color': '#d6e1e7'})
+                ], style={
+                    'top': 0,
+                    'backgroundColor': '#457b9a',
+                    'zIndex': 1000,
+                    'height': '45vh',
+                    "textAlign": "center",
+                    'fontSize':'50px'
+                }),
 
-                    html.Div([
-                        html.H2("Cancer Map Analysis", style={"textAlign": "center",'fontSize':'27px','color':'#0c425a'}),
+            html.Div([
+                    # Première ligne de graphiques -----
+                    html.Section([
                         html.Div([
+                            html.H2("Human papilllomavirus-related cancers", style={"textAlign": "center",'fontSize':'27px','color':'#0c425a'}),
+                            html.Div(className='row-fixed', children=[create_virus_animation()],
+                                     style={'height': '100%'}),
+
+                        html.P(
+                            "Click on a organ to see the attribution rate.",
+                            style={
+                                'textAlign': 'center',
+                                'marginTop': '10px',
+                                'fontSize': '14px',
+                                'color': '#666'
+                            }
+                        ),
+                        ], style={'width': '35%', 'padding': '10px', 'display': 'flex', 'flexDirection': 'column'}),
+
+                        html.Div([
+                            html.H2("Cancer Map Analysis", style={"textAlign": "center",'fontSize':'27px','color':'#0c425a'}),
                             html.Div([
-                                html.Label("Select a cancer type:"),
-                                dcc.Dropdown(
-                                    id="cancer-dropdown",
-                                    options=[{"label": cancer_labels[c], "value": c} for c in
-                                             df_cancer["Cancer"].unique()],
-                                    value=df_cancer["Cancer"].unique()[0],
-                                    clearable=False
-                                ),
-                            ], style={'width': '48%', 'paddingRight': '2%'}),
-                            html.Div([
-                                html.Label("Select an indicator:"),
-                                dcc.RadioItems(
-                                    id="type-radio",
-                                    options=[
-                                        {"label": "Incidence", "value": "incidence"},
-                                        {"label": "Mortality", "value": "mortalite"}
-                                    ],
-                                    value="incidence",
-                                    inline=True
-                                ),
-                            ], style={'width': '48%'}),
-                        ], style={'display': 'flex', 'justifyContent': 'space-between', 'padding': '10px'}),
-                        dcc.Graph(id="map-choropleth", style = {'height':'60vh'})
-                    ], style={'width': '65%', 'padding': '10px', 'display': 'flex', 'flexDirection': 'column'}),
-                    # 50% de la largeur
-                ], style={'display': 'flex', 'flexDirection': 'row','alignItems': 'center', 'height': '100vh', 'marginTop': '5vh','marginBottom':'15vh'},id="monde"),
-            ], style={'display': 'flex'}),
-
-            # Deuxième ligne de graphiques -----
-            html.Section(
-                [
-                # colonne gauche (65%)
-                html.Div([
-                    html.H2("HPV Vaccination Analysis",
-                            style={"textAlign": "center", 'marginTop': '10px', 'marginBottom': '10px','fontSize':'27px','color':'#0c425a'},id="vaccination"),
+                                html.Div([
+                                    html.Label("Select a cancer type:"),
+                                    dcc.Dropdown(
+                                        id="cancer-dropdown",
+                                        options=[{"label": cancer_labels[c], "value": c} for c in
+                                                 data.df_cancer["Cancer"].unique()],
+                                        value=data.df_cancer["Cancer"].unique()[0],
+                                        clearable=False
+                                    ),
+                                ], style={'width': '48%', 'paddingRight': '2%'}),
+                                html.Div([
+                                    html.Label("Select an indicator:"),
+                                    dcc.RadioItems(
+                                        id="type-radio",
+                                        options=[
+                                            {"label": "Incidence", "value": "incidence"},
+                                            {"label": "Mortality", "value": "mortalite"}
+                                        ],
+                                        value="incidence",
+                                        inline=True
+                                    ),
+                                ], style={'width': '48%'}),
+                            ], style={'display': 'flex', 'justifyContent': 'space-between', 'padding': '10px'}),
+                            dcc.Graph(id="map-choropleth", style = {'height':'60vh'})
+                        ], style={'width': '65%', 'padding': '10px', 'display': 'flex', 'flexDirection': 'column'}),
+                        # 50% de la largeur
+                    ], style={'display': 'flex', 'flexDirection': 'row','alignItems': 'center', 'height': '100vh', 'marginTop': '5vh','marginBottom':'15vh'},id="monde"),
+                ], style={'display': 'flex'}),
+
+                # Deuxième ligne de graphiques -----
+                html.Section(
+                    [
+                    # colonne gauche (65%)
                     html.Div([
-                        dcc.Slider(
-                            id='year-slider',
-                            min=int(df_hpv['Year'].min()),
-                            max=int(df_hpv['Year'].max()),
-                            value=2022,
-                            marks={str(year): str(year) for year in sorted(df_hpv['Year'].unique())},
-                            step=1
+                        html.H2("HPV Vaccination Analysis",
+                                style={"textAlign": "center", 'marginTop': '10px', 'marginBottom': '10px','fontSize':'27px','color':'#0c425a'},id="vaccination"),
+                        html.Div([
+                            dcc.Slider(
+                                id='year-slider',
+                                min=int(data.df_hpv['Year'].min()),
+                                max=int(data.df_hpv['Year'].max()),
+                                value=default_hpv_year,
+                                marks={str(year): str(year) for year in sorted(data.df_hpv['Year'].unique())},
+                                step=1
+                            ),
+
+                            html.Button("Play", id="play-button", n_clicks=0,
+                                    style={'marginLeft':'1.5vw'})
+                        ], style={'marginBottom': '10px'}),
+                        dcc.Store(id='hpv-frames', data=data.hpv_frames),
+                        dcc.Interval(
+                            id='interval-component',
+                            interval=1000,
+                            n_intervals=0,
+                            disabled=True
                         ),
 
-                        html.Button("Play", id="play-button", n_clicks=0,
-                                style={'marginLeft':'1.5vw'})
-                    ], style={'marginBottom': '10px'}),
-                    dcc.Interval(
-                        id='interval-component',
-                        interval=1000,
-                        n_intervals=0,
-                        disabled=True
-                    ),
+                        html.Div([
+                            # Carte
+                            html.Div([
+                                dcc.Graph(id='choropleth-map-hpv', figure=create_hpv_map_figure(default_hpv_year),
+                                          style={'height': '50vh', 'width': '120%', 'marginTop': '10px'})
+                            ], style={'width': '100%', 'display': 'block', 'textAlign': 'left'}),
+
+                            # Timeline
+                            html.Div([
+                                dcc.Graph(id='timeline-graph', figure=data.timeline_figure,
+                                          style={'height': '30vh', 'width': '100%'})
+                            ], style={'width': '100%', 'display': 'block'})
 
+                        ], style={'width': '70%', 'margin': 'auto', 'display': 'block', 'textAlign': 'center'})
+                    ], style={'width': '65%', 'display': 'inline-block', 'verticalAlign': 'top'}),
+
+                    # colonne droite (35%)
                     html.Div([
-                        # Carte
-                        html.Div([
-                            dcc.Graph(id='choropleth-map-hpv',
-                                      style={'height': '50vh', 'width': '120%', 'marginTop': '10px'})
-                        ], style={'width': '100%', 'display': 'block', 'textAlign': 'left'}),
+                        html.H2("Introduction",
+                                style={"textAlign": "center", 'marginTop': '10px', 'marginBottom': '10px','fontSize':'27px','color':'#0c425a'}),
+                        dcc.RangeSlider(
+                            id='year-range-slider',
+                            min=data.min_year,
+                            max=data.max_year,
+                            step=1,
+                            marks={year: str(year) for year in range(data.min_year, data.max_year + 1, 2)},
+                            value=[data.min_year, data.max_year],
+                            allowCross=False
+                        ),
+                        dcc.Dropdown(
+                            id='country-dropdown-intro',
+                            options=data.country_options,
+                            placeholder='Select a country...',
+                            style={'marginBottom': '10px','marginTop': '10px'}
+                        ),
+                        # Graphique vaccination
+                        dcc.Graph(id='vaccination-line-chart', style={'height': '55vh', 'width': '100%', 'marginTop': '0px'}),
+                        html.Div(id='selected-country-list', style={'height': '17vh', 'overflowY': 'auto'})
+                    ], style={'width': '35%', 'display': 'inline-block', 'verticalAlign': 'top', 'overflow': 'hidden'})
+                ], style={'display': 'flex', 'max-height': '100vh'}),
 
-                        # Timeline
-                        html.Div([
-                            dcc.Graph(id='timeline-graph',
-                                      style={'height': '30vh', 'width': '100%'})
-                        ], style={'width': '100%', 'display': 'block'})
-
-                    ], style={'width': '70%', 'margin': 'auto', 'display': 'block', 'textAlign': 'center'})
-                ], style={'width': '65%', 'display': 'inline-block', 'verticalAlign': 'top'}),
-
-                # colonne droite (35%)
-                html.Div([
-                    html.H2("Introduction",
-                            style={"textAlign": "center", 'marginTop': '10px', 'marginBottom': '10px','fontSize':'27px','color':'#0c425a'}),
-                    dcc.RangeSlider(
-                        id='year-range-slider',
-                        min=min_year,
-                        max=max_year,
-                        step=1,
-                        marks={year: str(year) for year in range(min_year, max_year + 1, 2)},
-                        value=[min_year, max_year],
-                        allowCross=False
-                    ),
-                    dcc.Dropdown(
-                        id='country-dropdown-intro',
-                        options=country_options,
-                        placeholder='Select a country...',
-                        style={'marginBottom': '10px','marginTop': '10px'}
-                    ),
-                    # Graphique vaccination
-                    dcc.Graph(id='vaccination-line-chart', style={'height': '55vh', 'width': '100%', 'marginTop': '0px'}),
-                    html.Div(id='selected-country-list', style={'height': '17vh', 'overflowY': 'auto'})
-                ], style={'width': '35%', 'display': 'inline-block', 'verticalAlign': 'top', 'overflow': 'hidden'})
-            ], id='vaccination', style={'display': 'flex', 'max-height': '100vh'}),
-
-            # Troisième ligne de graphiques -----
-            html.Section([
-                # carte dépistage (50%)
-                html.Div([
-                    html.H2("Incidence and Screening Rates by Region",
-                            style={'textAlign': 'center', 'marginBottom': '10px','marginTop':'20px','fontSize':'27px','color':'#0c425a'},id="zoom_france"),
-                    dcc.Dropdown(
-                        id='age-group-dropdown',
-                        options=[
-                            {'label': 'Incidence', 'value': 'incidence'},
-                            {'label': 'Global Screening', 'value': 'depistage_global'},
-                            {'label': '25-29 years', 'value': 'depistage_vingtaine'},
-                            {'label': '30-34 years', 'value': 'trentaine_trancheA'},
-                            {'label': '35-39 years', 'value': 'trentaine_trancheB'},
-                            {'label': '40-44 years', 'value': 'quarantaine_trancheA'},
-                            {'label': '45-49 years', 'value': 'quarantaine_trancheB'},
-                            {'label': '50-54 years', 'value': 'cinquantaine_trancheA'},
-                            {'label': '55-59 years', 'value': 'cinquantaine_trancheB'},
-                            {'label': '60-65 years', 'value': 'soixantaine'}
-
-                        ],
-                        value='depistage_global',
-                        clearable=False,
-                        style={'width': '90%', 'margin': '20px auto'}
-                    ),
-                    dcc.Graph(id="taux-depistage", style={'height': '45vh'})
-                ], style={'width': '50%', 'display': 'inline-block', 'verticalAlign': 'top'}),
-
-                # carte vacc (50%)
-                html.Div([
-                    html.H2("Vaccination Coverage at 16 Years old",
-                            style={'textAlign': 'center', 'marginBottom': '10px','marginTop':'20px','fontSize':'27px','color':'#0c425a'}),
+                # Troisième ligne de graphiques -----
+                html.Section([
+                    # carte dépistage (50%)
                     html.Div([
+                        html.H2("Incidence and Screening Rates by Region",
+                                style={'textAlign': 'center', 'marginBottom': '10px','marginTop':'20px','fontSize':'27px','color':'#0c425a'},id="zoom_france"),
                         dcc.Dropdown(
-                            id='sex-dropdown',
+                            id='age-group-dropdown',
                             options=[
-                                {'label': 'Girls', 'value': 'fille'},
-                                {'label': 'Boys', 'value': 'garcon'}
+                                {'label': 'Incidence', 'value': 'incidence'},
+                                {'label': 'Global Screening', 'value': 'depistage_global'},
+                                {'label': '25-29 years', 'value': 'depistage_vingtaine'},
+                                {'label': '30-34 years', 'value': 'trentaine_trancheA'},
+                                {'label': '35-39 years', 'value': 'trentaine_trancheB'},
+                                {'label': '40-44 years', 'value': 'quarantaine_trancheA'},
+                                {'label': '45-49 years', 'value': 'quarantaine_trancheB'},
+                                {'label': '50-54 years', 'value': 'cinquantaine_trancheA'},
+                                {'label': '55-59 years', 'value': 'cinquantaine_trancheB'},
+                                {'label': '60-65 years', 'value': 'soixantaine'}
+
                             ],
-                            value='fille',
+                            value='depistage_global',
                             clearable=False,
-                            style={'width': '45%', 'display': 'inline-block', 'marginRight': '10%'}
+                            style={'width': '90%', 'margin': '20px auto'}
                         ),
-                        dcc.Dropdown(
-                            id='year-dropdown',
-                            style={'width': '45%', 'display': 'inline-block'}
-                        )
-                    ], style={'margin': '20px'}),
-                    dcc.Graph(id='map', style={'height': '55vh'}),
-                    html.P(
-                        "Click on a region to see the evolution.",
-                        style={
-                            'textAlign': 'center',
-                            'marginTop': '10px',
-                            'fontSize': '14px',
-                            'color': '#666'
-                        }
-                    ),
-                    html.Div(
-                    html.Div(
-                        [
-                            # Bouton pour fermer la popup
-                            html.Button(
-                                "×",
-                                id="close-popup",
-                                style={
-                                    'position': 'absolute',
-                                    'top': '5px',
-                                    'right': '5px',
-                                    'background': 'none',
-                                    'border': 'none',
-                                    'fontSize': '20px',
-                                    'cursor': 'pointer',
-                                    'color': 'black'
-                                }
+                        dcc.Graph(id="taux-depistage", style={'height': '45vh'})
+                    ], style={'width': '50%', 'display': 'inline-block', 'verticalAlign': 'top'}),
+
+                    # carte vacc (50%)
+                    html.Div([
+                        html.H2("Vaccination Coverage at 16 Years old",
+                                style={'textAlign': 'center', 'marginBottom': '10px','marginTop':'20px','fontSize':'27px','color':'#0c425a'}),
+                        html.Div([
+                            dcc.Dropdown(
+                                id='sex-dropdown',
+                                options=[
+                                    {'label': 'Girls', 'value': 'fille'},
+                                    {'label': 'Boys', 'value': 'garcon'}
+                                ],
+                                value='fille',
+                                clearable=False,
+                                style={'width': '45%', 'display': 'inline-block', 'marginRight': '10%'}
                             ),
-                            # Graphique dans la popup
-                            dcc.Graph(
-                                id='popup-graph',
-                                style={'height': '40vh', 'width': '50vh'}
+                            dcc.Dropdown(
+                                id='year-dropdown',
+                                style={'width': '45%', 'display': 'inline-block'}
                             )
-                        ],
-                        id='popup',
-                        style={
-                            'display': 'none',
-                            'position': 'fixed',
-                            'top': '50%',
-                            'left': '50%',
-                            'transform': 'translate(-50%, -50%)',
-                            'backgroundColor': 'white',
-                            'padding': '10px',
-                            'zIndex': '1000',
-                            'width': '25%',
-                            'height': '40%'
-                        }
-                    ))
-                ], style={'width': '50%', 'display': 'inline-block', 'verticalAlign': 'top',
-                          'boxSizing': 'border-box', 'padding': '5px'})
-            ], style={'display': 'flex', 'marginBottom': '165px', 'height': '100vh','marginTop':'15vh'})
-    ], style={'width': '88%', 'display': 'flex', 'flexDirection': 'column', 'height': '100vh','marginLeft': '12%'})
-], style={'display': 'flex', 'height': '100vh', 'margin': 0, 'padding': 0})
+                        ], style={'margin': '20px'}),
+                        dcc.Graph(id='map', style={'height': '55vh'}),
+                        html.P(
+                            "Click on a region to see the evolution.",
+                            style={
+                                'textAlign': 'center',
+                                'marginTop': '10px',
+                                'fontSize': '14px',
+                                'color': '#666'
+                            }
+                        ),
+                        html.Div(
+                        html.Div(
+                            [
+                                # Bouton pour fermer la popup
+                                html.Button(
+                                    "×",
+                                    id="close-popup",
+                                    style={
+                                        'position': 'absolute',
+                                        'top': '5px',
+                                        'right': '5px',
+                                        'background': 'none',
+                                        'border': 'none',
+                                        'fontSize': '20px',
+                                        'cursor': 'pointer',
+                                        'color': 'black'
+                                    }
+                                ),
+                                # Graphique dans la popup
+                                dcc.Graph(
+                                    id='popup-graph',
+                                    style={'height': '40vh', 'width': '50vh'}
+                                )
+                            ],
+                            id='popup',
+                            style={
+                                'display': 'none',
+                                'position': 'fixed',
+                                'top': '50%',
+                                'left': '50%',
+                                'transform': 'translate(-50%, -50%)',
+                                'backgroundColor': 'white',
+                                'padding': '10px',
+                                'zIndex': '1000',
+                                'width': '25%',
+                                'height': '40%'
+                            }
+                        ))
+                    ], style={'width': '50%', 'display': 'inline-block', 'verticalAlign': 'top',
+                              'boxSizing': 'border-box', 'padding': '5px'})
+                ], style={'display': 'flex', 'marginBottom': '165px', 'height': '100vh','marginTop':'15vh'})
+        ], style={'width': '88%', 'display': 'flex', 'flexDirection': 'column', 'height': '100vh','marginLeft': '12%'})
+    ], style={'display': 'flex', 'height': '100vh', 'margin': 0, 'padding': 0})
+
+app.layout = serve_layout
 
 #LES CALLBACKs-----------------------------------------------------------
 
@@ -794,10 +793,13 @@ register_callbacks(app)
     [Input("cancer-dropdown", "value"),
      Input("type-radio", "value")]
 )
+@figure_cache.memoize("update_cancer_map", inputs=lambda: [(c, m) for c in cancers for m in metrics],
+                      version=data_refresher.version("cancer"))
 def update_cancer_map(selected_cancer, selected_type):
-    filtered_df = df_cancer[(df_cancer["Cancer"] == selected_cancer) & (df_cancer["Type"] == selected_type)]
+    data = data_refresher.current()
+    filtered_df = data.cancer_slices.get((selected_cancer, selected_type))
 
-    if filtered_df.empty:
+    if filtered_df is None or filtered_df.empty:
         return px.choropleth(title="No data available")
 
     cancer_label = cancer_labels.get(selected_cancer, selected_cancer).capitalize()
@@ -832,98 +834,124 @@ def update_cancer_map(selected_cancer, selected_type):
 
 
 # pour le troisème avec le monde
-@app.callback(
-    Output('choropleth-map-hpv', 'figure'),
-    [Input('year-slider', 'value')]
-)
-
 def update_hpv_map(year):
+    data = data_refresher.current()
+    # Mise à jour partielle de la carte de départ : seuls z et le titre changent
+    z = data.hpv_frames['z'].get(str(year))
+    if z is None:
+        return create_hpv_map_figure(year)
 
-    df_filtered = df_hpv[df_hpv['Year'] == year]
+    patched_figure = Patch()
+    patched_figure['data'][0]['z'] = z
+    patched_figure['layout']['title']['text'] = hpv_map_title.format(year=year)
+    return patched_figure
 
-    if df_filtered.empty:
-        return px.choropleth(title=f"No data available for Year {year}")
+def update_timeline(year):
+    # Mise à jour partielle : seule la position de la ligne verticale est envoyée
+    patched_figure = Patch()
+    patched_figure['layout']['shapes'][0]['x0'] = year
+    patched_figure['layout']['shapes'][0]['x1'] = year
+    return patched_figure
 
-    # Création du graphique 3
-    fig = px.choropleth(
-        df_filtered,
-        locations="Code",
-        color="_3_b_1__sh_acs_hpv",
-        hover_name="Entity",
-        hover_data={"_3_b_1__sh_acs_hpv": True, "Code": False},
-        labels={"_3_b_1__sh_acs_hpv": "Vaccination Rate (%)"},
-        title=f"HPV Vaccination Rates for Girls (Year {year})",
-        color_continuous_scale="Blues",
-        range_color=[0, 100]
+def toggle_animation(n_clicks, is_disabled):
+    return not is_disabled
 
-    )
+def animate_year(n_intervals, current_year):
+    data = data_refresher.current()
+    if current_year >= int(data.df_hpv['Year'].max()):
+        return int(data.df_hpv['Year'].min())
+    return current_year + 1
 
-    fig.update_geos(
-        showcoastlines=True,
-        coastlinecolor="Black",
-        showland=True,
-        landcolor="lightgray",
-        projection_type="mercator",
-        lonaxis=dict(showgrid=False, range=[-180, 180]),
-        lataxis=dict(showgrid=False, range=[-35, 90])
+if HPV_ANIMATION == "client":
+    # Lecture et déplacement du curseur entièrement dans le navigateur : les valeurs de
+    # chaque année (store hpv-frames) sont envoyées une fois avec la page
+    app.clientside_callback(
+        """
+        function(n_clicks, is_disabled) {
+            return !is_disabled;
+        }
+        """,
+        Output('interval-component', 'disabled'),
+        [Input('play-button', 'n_clicks')],
+        [State('interval-component', 'disabled')],
+        prevent_initial_call=True
     )
 
-    fig.update_traces(
-        hovertemplate="<b>%{hovertext}</b><br>" +
-                      "Vaccination Rate: %{z:.1f}%<extra></extra>"
+    app.clientside_callback(
+        """
+        function(n_intervals, current_year, frames) {
+            const years = frames.years;
+            const index = years.indexOf(current_year);
+            if (index < 0 || index === years.length - 1) {
+                return years[0];
+            }
+            return years[index + 1];
+        }
+        """,
+        Output('year-slider', 'value'),
+        [Input('interval-component', 'n_intervals')],
+        [State('year-slider', 'value'),
+         State('hpv-frames', 'data')],
+        prevent_initial_call=True
     )
 
-    fig.update_layout(
-        margin={"r": 20, "t": 30, "l": 20, "b": 20},
-        paper_bgcolor='white',
-        geo=dict(
-            bgcolor='white'
-    ))
-
-    return fig
-
-@app.callback(
-    Output('timeline-graph', 'figure'),
-    [Input('year-slider', 'value')]
-)
-def update_timeline(year):
-    df_grouped = df_hpv.groupby('Year')['_3_b_1__sh_acs_hpv'].mean().reset_index()
-
-    fig = px.line(
-        df_grouped,
-        x='Year',
-        y='_3_b_1__sh_acs_hpv',
-        title="Global HPV Vaccination Rate Trends",
-        labels={"_3_b_1__sh_acs_hpv": "Vaccination Rate (%)", "Year": "Year"},
-        markers=True
+    app.clientside_callback(
+        """
+        function(year, figure, frames) {
+            const z = frames.z[String(year)];
+            if (!figure || !z) {
+                return window.dash_clientside.no_update;
+            }
+            const title = Object.assign({}, figure.layout.title, {text: frames.title.replace('{year}', year)});
+            return Object.assign({}, figure, {
+                data: [Object.assign({}, figure.data[0], {z: z})].concat(figure.data.slice(1)),
+                layout: Object.assign({}, figure.layout, {title: title})
+            });
+        }
+        """,
+        Output('choropleth-map-hpv', 'figure'),
+        [Input('year-slider', 'value')],
+        [State('choropleth-map-hpv', 'figure'),
+         State('hpv-frames', 'data')]
     )
 
-    fig.add_vline(x=year, line_dash="dash", line_color="red")
-
-    fig.update_layout(
-        margin={"r": 15, "t": 30, "l": 15, "b": 10},
+    app.clientside_callback(
+        """
+        function(year, figure) {
+            if (!figure || !figure.layout.shapes || !figure.layout.shapes.length) {
+                return window.dash_clientside.no_update;
+            }
+            const shapes = figure.layout.shapes.slice();
+            shapes[0] = Object.assign({}, shapes[0], {x0: year, x1: year});
+            return Object.assign({}, figure, {layout: Object.assign({}, figure.layout, {shapes: shapes})});
+        }
+        """,
+        Output('timeline-graph', 'figure'),
+        [Input('year-slider', 'value')],
+        [State('timeline-graph', 'figure')]
     )
-
-    return fig
-
-@app.callback(
-    Output('interval-component', 'disabled'),
-    [Input('play-button', 'n_clicks')],
-    [State('interval-component', 'disabled')]
-)
-def toggle_animation(n_clicks, is_disabled):
-    return not is_disabled
-
-
-@app.callback(
-    Output('year-slider', 'value'),
-    [Input('interval-component', 'n_intervals')],
-    [State('year-slider', 'value')]
-)
-def animate_year(n_intervals, current_year):
-    if current_year >= int(df_hpv['Year'].max()):
-        return int(df_hpv['Year'].min())
-    return current_year + 1
+else:
+    app.callback(
+        Output('choropleth-map-hpv', 'figure'),
+        [Input('year-slider', 'value')]
+    )(update_hpv_map)
+
+    app.callback(
+        Output('timeline-graph', 'figure'),
+        [Input('year-slider', 'value')]
+    )(update_timeline)
+
+    app.callback(
+        Output('interval-component', 'disabled'),
+        [Input('play-button', 'n_clicks')],
+        [State('interval-component', 'disabled')]
+    )(toggle_animation)
+
+    app.callback(
+        Output('year-slider', 'value'),
+        [Input('interval-component', 'n_intervals')],
+        [State('year-slider', 'value')]
+    )(animate_year)
 
 
 #Pour le quatrième introduction du vaccin dans le monde
@@ -933,8 +961,9 @@ def animate_year(n_intervals, current_year):
      Input('country-dropdown-intro', 'value')]
 )
 def update_intro_chart(selected_year_range, selected_country):
+    data = data_refresher.current()
     start_year, end_year = selected_year_range
-    filtered_data = cumulative_df[(cumulative_df['Year'] >= start_year) & (cumulative_df['Year'] <= end_year)]
+    filtered_data = data.cumulative_df[(data.cumulative_df['Year'] >= start_year) & (data.cumulative_df['Year'] <= end_year)]
 
     fig = go.Figure()
     fig.add_trace(go.Scatter(
@@ -948,12 +977,12 @@ def update_intro_chart(selected_year_range, selected_country):
     ))
 
     if selected_country:
-        country_data = filtered_df_intro[filtered_df_intro['Entity'] == selected_country]
+        country_data = data.filtered_df_intro[data.filtered_df_intro['Entity'] == selected_country]
         if not country_data.empty:
             intro_year = country_data['Year'].values[0]
             fig.add_trace(go.Scatter(
                 x=[intro_year],
-                y=[cumulative_df[cumulative_df['Year'] == intro_year]['Total_Countries'].values[0]],
+                y=[data.cumulative_df[data.cumulative_df['Year'] == intro_year]['Total_Countries'].values[0]],
                 mode='markers',
                 marker=dict(size=10, color='red'),
                 name=f'{selected_country} introduced',
@@ -972,11 +1001,12 @@ def update_intro_chart(selected_year_range, selected_country):
     [Input('vaccination-line-chart', 'clickData')]
 )
 def display_selected_countries(clickData):
+    data = data_refresher.current()
     if clickData is None:
         return "Click on a point to see the list of new countries."
 
     selected_year = clickData['points'][0]['x']
-    new_countries = new_countries_by_year.get(selected_year, set())
+    new_countries = data.new_countries_by_year.get(selected_year, set())
     if not new_countries:
         return f"No new countries introduced HPV vaccination in {selected_year}."
     return f"Year {selected_year}: {', '.join(sorted(new_countries))}"
@@ -986,9 +1016,12 @@ def display_selected_countries(clickData):
     Output('taux-depistage', 'figure'),
     Input('age-group-dropdown', 'value')
 )
+@figure_cache.memoize("update_map_depistage", inputs=lambda: [(col,) for col in data_refresher.current().df_depistage.columns[3:]],
+                      version=data_refresher.version("depistage"))
 def update_map(selected_age_group):
+    data = data_refresher.current()
     fig = px.choropleth(
-        df_depistage,
+        data.df_depistage,
         geojson=geojson_data,
         locations="libelle_region",
         featureidkey="properties.nom",
@@ -1036,15 +1069,16 @@ def update_map(selected_age_group):
     [Input('sex-dropdown', 'value')]
 )
 def update_year_dropdown(selected_sex):
+    data = data_refresher.current()
     if selected_sex == 'garcon':
         desired_years = ['2006', '2007']
-        available_years = [year for year in desired_years if year in df_garcons.columns]
+        available_years = [year for year in desired_years if year in data.df_garcons.columns]
         if not available_years:
-            available_years = [str(col) for col in df_garcons.columns if col != "Région"]
+            available_years = [str(col) for col in data.df_garcons.columns if col != "Région"]
         options = [{'label': str(int(year) + 16), 'value': year} for year in available_years]
         default_value = available_years[0]
     else:
-        available_years = [str(col) for col in df_filles.columns if col != "Région"]
+        available_years = [str(col) for col in data.df_filles.columns if col != "Région"]
         options = [{'label': str(int(year) + 16), 'value': year} for year in available_years]
         default_value = available_years[0]
     return options, default_value
@@ -1054,17 +1088,23 @@ def update_year_dropdown(selected_sex):
     [Input('year-dropdown', 'value'),
      Input('sex-dropdown', 'value')]
 )
+@figure_cache.memoize("update_map_vaccination", version=data_refresher.version("couverture"), inputs=lambda: [
+    (str(col), sex) for sex, df in [('fille', data_refresher.current().df_filles),
+                                    ('garcon', data_refresher.current().df_garcons)]
+    for col in df.columns if col != "Région"
+])
 def update_map(selected_year, selected_sex):
+    data = data_refresher.current()
     if selected_sex == 'garcon':
-        available_years = [str(col) for col in df_garcons.columns if col != "Région"]
+        available_years = [str(col) for col in data.df_garcons.columns if col != "Région"]
         if selected_year not in available_years:
             selected_year = available_years[0] if available_years else None
-        df_selected = df_garcons[['Région', selected_year]].copy()
+        df_selected = data.df_garcons[['Région', selected_year]].copy()
     else:
-        available_years = [str(col) for col in df_filles.columns if col != "Région"]
+        available_years = [str(col) for col in data.df_filles.columns if col != "Région"]
         if selected_year not in available_years:
             selected_year = available_years[0] if available_years else None
-        df_selected = df_filles[['Région', selected_year]].copy()
+        df_selected = data.df_filles[['Région', selected_year]].copy()
 
     df_selected[selected_year] = pd.to_numeric(df_selected[selected_year], errors='coerce').fillna(0)
 
@@ -1099,6 +1139,7 @@ def update_map(selected_year, selected_sex):
     [State('popup', 'style')]
 )
 def update_popup_and_close(clickData, selected_sex, n_clicks, current_style):
+    data = data_refresher.current()
     ctx = callback_context
     trigger_id = ctx.triggered[0]['prop_id'].split('.')[0]
 
@@ -1120,9 +1161,9 @@ def update_popup_and_close(clickData, selected_sex, n_clicks, current_style):
         return go.Figure(), current_style
 
     if selected_sex == 'garcon':
-        df_filtered = df_garcons_melted[df_garcons_melted['Région'] == region]
+        df_filtered = data.df_garcons_melted[data.df_garcons_melted['Région'] == region]
     else:
-        df_filtered = df_filles_melted[df_filles_melted['Région'] == region]
+        df_filtered = data.df_filles_melted[data.df_filles_melted['Région'] == region]
     df_filtered = df_filtered.sort_values('Année')
 
     fig = px.line(
@@ -1145,6 +1186,34 @@ def update_popup_and_close(clickData, selected_sex, n_clicks, current_style):
     current_style['display'] = 'block'
     return fig, current_style
 
+# Figures précalculées (python -m dashboard.precompute), versionnées par les données lues,
+# app.py et la géométrie : après une mise à jour, le store est ignoré jusqu'au précalcul suivant
+if FIGURE_STORE_ENABLED:
+    figure_cache.store = FigureStore(FIGURE_STORE_DIR, data_version(
+        [source.last_key for source in [*cancer_sources.values(), hpv_source, intro_source,
+                                        depistage_source, filles_source, garcons_source]],
+        [os.path.abspath(__file__), GEO_ARTIFACT_PATH]
+    ))
+
+# Après un rafraîchissement des données : le store ne correspond plus qu'aux données du
+# démarrage, et les figures des groupes reconstruits sont préchauffées en arrière-plan
+def on_data_refresh(snapshot, groups):
+    figure_cache.store = None
+    if WARMUP_FIGURES:
+        figure_cache.warmup()
+
+data_refresher.listeners.append(on_data_refresh)
+
+# Préchauffage du cache de figures (DASH_WARMUP_FIGURES=1)
+if WARMUP_FIGURES:
+    startup.begin("préchauffage des figures")
+    figure_cache.warmup()
+
+# Tableau récapitulatif du démarrage (DASH_STARTUP_PROFILE=0 pour le désactiver)
+startup.finish()
+
 if __name__ == '__main__':
-    port = int(os.environ.get('PORT', 5000)) 
-    app.run_server(debug=True, host='0.0.0.0', port=port)
+    # Serveur de développement Flask (un seul process) ; DASH_DEBUG=1 active le débogueur
+    # et le rechargement automatique. En production, utiliser gunicorn (voir gunicorn.conf.py).
+    port = int(os.environ.get('PORT', 5000))
+    app.run_server(debug=os.environ.get('DASH_DEBUG', '0') == '1', host='0.0.0.0', port=port)
@@ -0,0 +1,173 @@
+"""Benchmark hors ligne de tous les callbacks serveur sur tout leur espace d'entrées.
+
+    python benchmarks/bench_callbacks.py [--repeat 3] [--filter update_map] [--no-history]
+
+Le dashboard est importé sur les fichiers locaux de ``data/`` sans aucun accès réseau
+(``DASH_OFFLINE=1`` : l'artefact ``data/geo/`` doit exister, voir
+``python -m dashboard.geometry``) et avec le cache de figures désactivé, pour mesurer
+la construction des figures. Chaque fonction est appelée directement pour chaque
+combinaison : cancer × indicateur, année HPV, tranche d'âge du dépistage, sexe ×
+année de naissance, clics sur les régions pour la popup, etc.
+
+Pour chaque cas : meilleur temps et médiane sur ``--repeat`` appels, taille de la
+réponse JSON. Les résultats sont ajoutés à ``benchmarks/results/callbacks.jsonl``
+et comparés au run précédent ; un cas plus lent de plus de ``--threshold`` est signalé
+et le code de sortie vaut 1.
+"""
+import argparse
+import contextvars
+import datetime
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HISTORY_PATH = os.path.join(ROOT_DIR, "benchmarks", "results", "callbacks.jsonl")
+
+# A positionner avant l'import d'app.py
+os.environ.setdefault("DASH_OFFLINE", "1")
+os.environ.setdefault("DASH_FIGURE_CACHE", "0")
+os.environ.setdefault("DASH_METRICS", "0")
+os.environ.setdefault("DASH_STARTUP_PROFILE", "0")
+os.environ.setdefault("DASH_HPV_ANIMATION", "server")
+sys.path.insert(0, ROOT_DIR)
+
+
+def build_cases(app):
+    """Liste de (callback, libellé du cas, fonction, arguments, prop_id déclencheur)."""
+    data = app.data_refresher.snapshot
+    years = sorted(int(year) for year in data.df_hpv['Year'].unique())
+
+    cases = []
+    # Callbacks mémoïsés : la fonction non cachée, sur les entrées déclarées pour le warmup
+    for name, (wrapper, inputs) in app.figure_cache.callbacks.items():
+        for args in inputs():
+            cases.append((name, "/".join(str(arg) for arg in args), wrapper.uncached, tuple(args), None))
+    for year in years:
+        cases.append(("update_hpv_map", str(year), app.update_hpv_map, (year,), None))
+        cases.append(("update_timeline", str(year), app.update_timeline, (year,), None))
+    for sex in ["fille", "garcon"]:
+        cases.append(("update_year_dropdown", sex, app.update_year_dropdown, (sex,), None))
+    for year in sorted(data.new_countries_by_year):
+        click = {"points": [{"x": year}]}
+        cases.append(("display_selected_countries", str(year), app.display_selected_countries, (click,), None))
+
+    year_range = [data.min_year, data.max_year]
+    for country in [None] + sorted(data.filtered_df_intro['Entity'].unique())[::20]:
+        cases.append(("update_intro_chart", country or "-", app.update_intro_chart, (year_range, country), None))
+    for sex, df in [("fille", data.df_filles), ("garcon", data.df_garcons)]:
+        for region in df["Région"]:
+            click = {"points": [{"location": region}]}
+            cases.append(("update_popup_and_close", f"{sex}/{region}", app.update_popup_and_close,
+                          (click, sex, None, {"display": "none"}), "map.clickData"))
+    return cases
+
+
+def run_case(func, args, trigger):
+    if trigger is None:
+        return func(*args)
+    # Les callbacks qui lisent callback_context ont besoin d'un contexte Dash
+    from dash._callback_context import context_value
+    from dash._utils import AttributeDict
+
+    def call():
+        context_value.set(AttributeDict(triggered_inputs=[{"prop_id": trigger, "value": args[0]}]))
+        return func(*args)
+    return contextvars.copy_context().run(call)
+
+
+def response_size(result):
+    from plotly.io.json import to_json_plotly
+    if hasattr(result, "to_plotly_json") and not hasattr(result, "to_dict"):
+        result = result.to_plotly_json()
+    return len(to_json_plotly(result))
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_previous(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        lines = [line for line in f if line.strip()]
+    return json.loads(lines[-1]) if lines else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--filter", help="ne garder que les callbacks dont le nom contient ce texte")
+    parser.add_argument("--history", default=HISTORY_PATH)
+    parser.add_argument("--no-history", action="store_true", help="ne pas enregistrer ce run")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="ralentissement relatif signalé comme régression (0.25 = +25%%)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    import app
+    import_time = time.perf_counter() - start
+
+    results = {}
+    for callback, label, func, call_args, trigger in build_cases(app):
+        if args.filter and args.filter not in callback:
+            continue
+        timings = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            result = run_case(func, call_args, trigger)
+            timings.append(time.perf_counter() - t0)
+        results[f"{callback}[{label}]"] = {
+            "callback": callback,
+            "best_s": min(timings),
+            "median_s": statistics.median(timings),
+            "bytes": response_size(result),
+        }
+
+    # Résumé par callback
+    print(f"Import du dashboard : {import_time:.2f}s")
+    print(f"{'Callback':<26}{'Cas':>5}{'Médiane':>11}{'Max':>11}{'Octets moy.':>13}")
+    by_callback = {}
+    for result in results.values():
+        by_callback.setdefault(result["callback"], []).append(result)
+    for callback, items in by_callback.items():
+        medians = [item["median_s"] for item in items]
+        print(f"{callback:<26}{len(items):>5}{statistics.median(medians) * 1000:>9.1f}ms"
+              f"{max(medians) * 1000:>9.1f}ms{statistics.mean(item['bytes'] for item in items):>13.0f}")
+
+    previous = load_previous(args.history)
+    regressions = []
+    if previous:
+        for case, result in results.items():
+            before = previous["cases"].get(case)
+            if before and result["best_s"] > before["best_s"] * (1 + args.threshold) and result["best_s"] > 0.005:
+                regressions.append((case, before["best_s"], result["best_s"]))
+        print(f"\nComparaison avec le run {previous.get('revision')} du {previous.get('date')} :")
+        for case, before, after in regressions:
+            print(f"  RÉGRESSION {case}: {before * 1000:.1f}ms -> {after * 1000:.1f}ms")
+        if not regressions:
+            print("  aucune régression")
+
+    if not args.no_history:
+        os.makedirs(os.path.dirname(args.history), exist_ok=True)
+        with open(args.history, "a", encoding="utf-8") as f:
+            f.write(json.dumps({
+                "date": datetime.datetime.now().isoformat(timespec="seconds"),
+                "revision": git_revision(),
+                "import_s": import_time,
+                "cases": results,
+            }) + "\n")
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Extraction des tableaux GCO : une requête WebDriver par cellule contre ``outerHTML`` analysé
+dans le process.
+
+    python benchmarks/bench_gco_extract.py [--fixtures DIR] [--repeat 3] [--no-browser]
+
+``DIR`` contient des pages enregistrées par ``2_scrap_gco.py --record --fixtures DIR`` (par
+défaut la page réduite versionnée dans ``scraping_code/2_scrap_cancers/fixtures/``).
+Première partie, sans navigateur : analyse du HTML seul, lxml contre ``html.parser``.
+Seconde partie : chaque page est rejouée par le serveur local dans un Chrome headless, le
+tableau est lu des deux façons (``--extract cells`` / ``html``) et les DataFrames obtenus
+doivent être identiques.
+"""
+import argparse
+import importlib.util
+import os
+import sys
+import time
+
+import pandas as pd
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT_PATH = os.path.join(ROOT_DIR, "scraping_code", "2_scrap_cancers", "2_scrap_gco.py")
+FIXTURES_DIR = os.path.join(ROOT_DIR, "scraping_code", "2_scrap_cancers", "fixtures")
+
+
+def load_extractor():
+    # Le nom du script commence par un chiffre : import par son chemin
+    spec = importlib.util.spec_from_file_location("scrap_gco", SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def best_of(func, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def fixture_pages(gco, directory):
+    pages = []
+    for cancer in gco.CANCERS:
+        for metric in gco.METRICS:
+            path = os.path.join(directory, gco.fixture_name(cancer, metric))
+            if os.path.exists(path):
+                pages.append((cancer, metric, path))
+    return pages
+
+
+def bench_parsers(gco, pages, repeat):
+    print(f"{'Page':<26}{'Lignes':>7}{'html.parser':>13}{'lxml':>9}")
+    for cancer, metric, path in pages:
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        t_std, (headers, rows) = best_of(lambda: gco.parse_table_html(html, use_lxml=False), repeat)
+        line = f"{cancer + '/' + metric:<26}{len(rows):>7}{t_std * 1000:>11.2f}ms"
+        if gco.HAS_LXML:
+            t_lxml, parsed = best_of(lambda: gco.parse_table_html(html, use_lxml=True), repeat)
+            assert parsed == (headers, rows), f"{path} : lxml et html.parser divergent"
+            line += f"{t_lxml * 1000:>7.2f}ms"
+        print(line)
+
+
+def bench_browser(gco, pages, directory, repeat, timeout):
+    server, base_url = gco.serve_fixtures(directory)
+    driver = gco.make_driver(page_timeout=60)
+    print(f"\n{'Page':<26}{'Lignes':>7}{'cellules':>11}{'outerHTML':>11}{'Gain':>8}")
+    total_cells = total_html = 0.0
+    try:
+        for cancer, metric, _ in pages:
+            driver.get(gco.table_url(base_url, cancer, metric))
+            table = gco.WebDriverWait(driver, timeout, poll_frequency=0.1).until(gco.table_ready)
+            t_cells, by_cells = best_of(lambda: gco.read_table(table, "cells"), repeat)
+            t_html, by_html = best_of(lambda: gco.read_table(table, "html"), repeat)
+            pd.testing.assert_frame_equal(by_cells, by_html)
+            total_cells += t_cells
+            total_html += t_html
+            print(f"{cancer + '/' + metric:<26}{len(by_html):>7}{t_cells * 1000:>9.0f}ms"
+                  f"{t_html * 1000:>9.1f}ms{t_cells / t_html:>7.0f}x")
+    finally:
+        driver.quit()
+        server.shutdown()
+    print(f"{'Total':<26}{'':>7}{total_cells * 1000:>9.0f}ms{total_html * 1000:>9.1f}ms"
+          f"{total_cells / total_html:>7.0f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="dossier des pages enregistrées")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--no-browser", action="store_true", help="analyse du HTML seulement")
+    args = parser.parse_args()
+
+    gco = load_extractor()
+    pages = fixture_pages(gco, args.fixtures)
+    if not pages:
+        sys.exit(f"Aucune page enregistrée dans {args.fixtures} "
+                 f"(python {os.path.relpath(SCRIPT_PATH, ROOT_DIR)} --record --fixtures {args.fixtures})")
+
+    bench_parsers(gco, pages, args.repeat)
+    if not args.no_browser:
+        bench_browser(gco, pages, args.fixtures, args.repeat, args.timeout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Micro-benchmark : encarts DOM-TOM en Python pur (version historique d'app.py)
+contre le moteur vectorisé ``dashboard.geometry.GeometryArray``.
+
+    python benchmarks/bench_geometry.py [regions.geojson] [--repeat 5] [--points 5000]
+
+Sans fichier, un jeu synthétique de 18 régions est généré (``--points`` sommets par
+anneau). Toutes les entités passent par la transformation pour mesurer le coût à
+l'échelle de géographies plus fines.
+"""
+import argparse
+import copy
+import json
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dashboard.geometry import GeometryArray, apply_insets  # noqa: E402
+
+
+# Version historique (boucles Python) -------------------------------------------
+
+def translate_geometry(geometry, delta_lon, delta_lat):
+    if geometry["type"] == "Polygon":
+        geometry["coordinates"] = [[[lon + delta_lon, lat + delta_lat] for lon, lat in ring]
+                                   for ring in geometry["coordinates"]]
+    elif geometry["type"] == "MultiPolygon":
+        geometry["coordinates"] = [[[[lon + delta_lon, lat + delta_lat] for lon, lat in ring]
+                                    for ring in polygon] for polygon in geometry["coordinates"]]
+    return geometry
+
+
+def scale_geometry(geometry, scale_factor, center_lon, center_lat):
+    def scale_ring(ring):
+        return [[(lon - center_lon) * scale_factor + center_lon,
+                 (lat - center_lat) * scale_factor + center_lat] for lon, lat in ring]
+    if geometry["type"] == "Polygon":
+        geometry["coordinates"] = [scale_ring(ring) for ring in geometry["coordinates"]]
+    elif geometry["type"] == "MultiPolygon":
+        geometry["coordinates"] = [[scale_ring(ring) for ring in polygon] for polygon in geometry["coordinates"]]
+    return geometry
+
+
+def compute_bounding_box(geometry):
+    lons, lats = [], []
+    polygons = [geometry["coordinates"]] if geometry["type"] == "Polygon" else geometry["coordinates"]
+    for polygon in polygons:
+        for ring in polygon:
+            for lon, lat in ring:
+                lons.append(lon)
+                lats.append(lat)
+    return min(lons), max(lons), min(lats), max(lats)
+
+
+def scale_and_translate_geometry(geometry, target_dim, target_position):
+    min_lon, max_lon, min_lat, max_lat = compute_bounding_box(geometry)
+    center_lon = (min_lon + max_lon) / 2
+    center_lat = (min_lat + max_lat) / 2
+    current_dim = max(max_lon - min_lon, max_lat - min_lat)
+    scale_factor = target_dim / current_dim if current_dim else 1
+    scaled_geo = scale_geometry(geometry, scale_factor, center_lon, center_lat)
+    min_lon2, max_lon2, min_lat2, max_lat2 = compute_bounding_box(scaled_geo)
+    delta_lon = target_position[0] - (min_lon2 + max_lon2) / 2
+    delta_lat = target_position[1] - (min_lat2 + max_lat2) / 2
+    return translate_geometry(scaled_geo, delta_lon, delta_lat)
+
+
+def legacy_insets(geojson_data, positions, target_dim=2.0):
+    for feature in geojson_data["features"]:
+        name = feature["properties"]["nom"]
+        if name in positions:
+            feature["geometry"] = scale_and_translate_geometry(feature["geometry"], target_dim, positions[name])
+    return geojson_data
+
+
+# Données ------------------------------------------------------------------------
+
+def synthetic_regions(n_regions=18, points=5000):
+    features = []
+    for i in range(n_regions):
+        ring = [[i + math.cos(2 * math.pi * k / points), 45 + math.sin(2 * math.pi * k / points)]
+                for k in range(points)]
+        ring.append(ring[0])
+        geometry = ({"type": "Polygon", "coordinates": [ring]} if i % 2 else
+                    {"type": "MultiPolygon", "coordinates": [[ring], [ring[::7] + [ring[0]]]]})
+        features.append({"type": "Feature", "geometry": geometry, "properties": {"nom": f"region_{i}"}})
+    return {"type": "FeatureCollection", "features": features}
+
+
+def best_of(func, data, repeat):
+    timings = []
+    for _ in range(repeat):
+        copy_ = copy.deepcopy(data)
+        start = time.perf_counter()
+        result = func(copy_)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("geojson", nargs="?")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--points", type=int, default=5000)
+    args = parser.parse_args()
+
+    if args.geojson:
+        with open(args.geojson, encoding="utf-8") as f:
+            data = json.load(f)
+    else:
+        data = synthetic_regions(points=args.points)
+
+    # Toutes les entités sont déplacées, comme le seraient des géographies plus fines
+    positions = {f["properties"]["nom"]: (-8, 41 + 2 * i) for i, f in enumerate(data["features"])}
+    import dashboard.geometry as geometry
+    geometry.target_positions = positions
+
+    n_points = len(GeometryArray.from_features(data["features"]).coords)
+    print(f"{len(data['features'])} entités, {n_points} sommets, meilleur temps sur {args.repeat} essais")
+
+    t_legacy, legacy = best_of(lambda d: legacy_insets(d, positions), data, args.repeat)
+    t_numpy, vectorized = best_of(apply_insets, data, args.repeat)
+
+    features = data["features"]
+    t_bounds_legacy = min(_timed(lambda: [compute_bounding_box(f["geometry"]) for f in features])
+                          for _ in range(args.repeat))
+    array = GeometryArray.from_features(features)
+    t_bounds_numpy = min(_timed(array.bounds) for _ in range(args.repeat))
+
+    a = GeometryArray.from_features(legacy["features"]).coords
+    b = GeometryArray.from_features(vectorized["features"]).coords
+    print(f"{'encarts (Python)':<24}{t_legacy * 1000:9.1f} ms")
+    print(f"{'encarts (NumPy)':<24}{t_numpy * 1000:9.1f} ms   x{t_legacy / t_numpy:.1f}")
+    print(f"{'bornes (Python)':<24}{t_bounds_legacy * 1000:9.1f} ms")
+    print(f"{'bornes (NumPy)':<24}{t_bounds_numpy * 1000:9.1f} ms   x{t_bounds_legacy / t_bounds_numpy:.1f}")
+    print(f"écart max entre les deux versions : {np.abs(a - b).max():.2e} degré")
+
+
+def _timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
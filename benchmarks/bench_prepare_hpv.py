@@ -0,0 +1,70 @@
+"""Compare ``dashboard.hpv.prepare_hpv_data`` (jointure unique) à l'ancienne boucle année par année.
+
+    python benchmarks/bench_prepare_hpv.py [--years 200]
+
+Mesure les deux versions sur ``data/3_HPV_vaccine_data.csv`` élargi à ``--years`` années
+(mêmes pays, valeurs décalées) pour suivre le passage à l'échelle. L'égalité des résultats
+est vérifiée par ``tests/test_prepare_hpv.py``.
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from dashboard.hpv import gapminder_iso_map, prepare_hpv_data  # noqa: E402
+from dashboard.sources import DataSource  # noqa: E402
+
+
+def legacy_prepare_hpv_data(df, iso_map):
+    all_countries = pd.DataFrame({
+        'Entity': list(iso_map.keys()),
+        'Code': list(iso_map.values())
+    })
+    years = df['Year'].unique()
+    complete_data = []
+
+    for year in years:
+        year_data = df[df['Year'] == year].copy()
+        merged = all_countries.merge(year_data, on=['Entity', 'Code'], how='left')
+        merged['Year'] = year
+        merged['_3_b_1__sh_acs_hpv'] = merged['_3_b_1__sh_acs_hpv'].fillna(0)
+        complete_data.append(merged)
+
+    return pd.concat(complete_data, ignore_index=True)
+
+
+def timed(func, df, iso_map):
+    start = time.perf_counter()
+    result = func(df, iso_map)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--years", type=int, default=200)
+    args = parser.parse_args()
+
+    iso_map = gapminder_iso_map()
+    # Nom distinct de la source de l'app : d'autres options de lecture, donc son propre cache
+    df = DataSource("hpv_vaccine_bench", "3_HPV_vaccine_data.csv", sep=";", skiprows=1).load()
+
+    first_year = int(df['Year'].min())
+    span = int(df['Year'].max()) - first_year + 1
+    large = pd.concat([df.assign(Year=df['Year'] + span * k) for k in range(max(1, args.years // span))],
+                      ignore_index=True)
+    t_legacy, expected = timed(legacy_prepare_hpv_data, large, iso_map)
+    t_new, result = timed(prepare_hpv_data, large, iso_map)
+    # Entity et Code sont catégoriels dans la nouvelle version : on compare les valeurs
+    pd.testing.assert_frame_equal(result.astype({'Entity': object, 'Code': object}), expected)
+    print(f"{large['Year'].nunique()} années, {len(result)} lignes en sortie")
+    print(f"  boucle par année : {t_legacy * 1000:8.1f} ms")
+    print(f"  jointure unique  : {t_new * 1000:8.1f} ms   x{t_legacy / t_new:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Mémoire des tables : lecture typée (usecols, dtypes, catégories, arrondi) contre lecture brute.
+
+    python benchmarks/bench_table_memory.py
+
+Pour chaque source de app.py, le CSV est relu tel quel (séparateur et lignes de titre
+seulement, comme avant) puis avec la déclaration complète de ``DataSource`` ; la
+mémoire est mesurée avec ``memory_usage(deep=True)`` (chaînes Python comprises). La
+seconde partie donne l'empreinte des tables finales gardées en mémoire par chaque worker.
+"""
+import io
+import os
+import sys
+import time
+
+import pandas as pd
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("DASH_OFFLINE", "1")
+os.environ.setdefault("DASH_STARTUP_PROFILE", "0")
+os.environ.setdefault("DASH_METRICS", "0")
+sys.path.insert(0, ROOT_DIR)
+
+LEGACY_KWARGS = ("sep", "skiprows")
+
+
+def frame_bytes(df):
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+def timed_parse(func, raw, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = func(raw)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, df
+
+
+def main():
+    import app
+
+    sources = [*app.cancer_sources.values(), app.hpv_source, app.intro_source, app.depistage_source,
+               app.filles_source, app.garcons_source]
+
+    print(f"{'Source':<34}{'Avant':>10}{'Après':>10}{'Gain':>7}{'Parse avant':>13}{'après':>9}")
+    total_before = total_after = 0
+    for source in sources:
+        raw = source.read_bytes()
+        legacy_kwargs = {key: value for key, value in source.read_kwargs.items() if key in LEGACY_KWARGS}
+        t_before, before = timed_parse(lambda data: pd.read_csv(io.BytesIO(data), **legacy_kwargs), raw)
+        t_after, after = timed_parse(source.parse, raw)
+        size_before, size_after = frame_bytes(before), frame_bytes(after)
+        total_before += size_before
+        total_after += size_after
+        print(f"{source.name:<34}{size_before / 1024:>8.0f}Ko{size_after / 1024:>8.0f}Ko"
+              f"{1 - size_after / size_before:>7.0%}{t_before * 1000:>11.2f}ms{t_after * 1000:>7.2f}ms")
+    print(f"{'Total':<34}{total_before / 1024:>8.0f}Ko{total_after / 1024:>8.0f}Ko"
+          f"{1 - total_after / total_before:>7.0%}")
+
+    data = app.data_refresher.snapshot
+    tables = {
+        "df_cancer": data.df_cancer,
+        "cancer_slices (16)": pd.concat(data.cancer_slices.values()),
+        "df_hpv": data.df_hpv,
+        "filtered_df_intro": data.filtered_df_intro,
+        "df_depistage": data.df_depistage,
+        "df_filles": data.df_filles,
+        "df_garcons": data.df_garcons,
+        "df_filles_melted": data.df_filles_melted,
+        "df_garcons_melted": data.df_garcons_melted,
+    }
+    print(f"\n{'Table finale':<34}{'Lignes':>8}{'Mémoire':>10}")
+    for name, df in tables.items():
+        print(f"{name:<34}{len(df):>8}{frame_bytes(df) / 1024:>8.0f}Ko")
+    print(f"{'Total':<34}{'':>8}{sum(frame_bytes(df) for df in tables.values()) / 1024:>8.0f}Ko")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Mémoire résidente par worker gunicorn, avec et sans les tables partagées.
+
+    python benchmarks/bench_worker_rss.py [--workers 4] [--interactions 40]
+
+Pour chaque configuration (``DASH_SHARED_TABLES`` 0/1 × ``GUNICORN_PRELOAD`` 1/0), le
+dashboard est démarré avec ``gunicorn.conf.py``, chaque worker reçoit des interactions
+(voir ``load_test.py``), puis ``/proc/<pid>/smaps_rollup`` est relu pour chaque worker :
+
+    RSS  pages résidentes, partagées ou non (ce qu'affichent top / ps)
+    PSS  pages partagées divisées par le nombre de process qui les utilisent
+    USS  pages privées du worker : ce que coûte un worker de plus
+
+Nécessite Linux (``/proc``) et gunicorn.
+"""
+import argparse
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from load_test import DashClient, Recorder, build_interactions, discover_regions, free_port  # noqa: E402
+
+import requests  # noqa: E402
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIGS = [
+    ("preload, sans partage", {"DASH_SHARED_TABLES": "0", "GUNICORN_PRELOAD": "1"}),
+    ("preload, tables partagées", {"DASH_SHARED_TABLES": "1", "GUNICORN_PRELOAD": "1"}),
+    ("sans preload, sans partage", {"DASH_SHARED_TABLES": "0", "GUNICORN_PRELOAD": "0"}),
+    ("sans preload, tables partagées", {"DASH_SHARED_TABLES": "1", "GUNICORN_PRELOAD": "0"}),
+]
+
+
+def memory_kb(pid):
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                values[parts[0].rstrip(":")] = int(parts[1])
+    return {"rss": values["Rss"], "pss": values["Pss"],
+            "uss": values["Private_Clean"] + values["Private_Dirty"]}
+
+
+def children(pid):
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(child) for child in f.read().split()]
+
+
+def wait_for_workers(process, base_url, workers, boot_timeout):
+    deadline = time.perf_counter() + boot_timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn s'est arrêté (code {process.returncode})")
+        try:
+            ready = requests.get(base_url + "/_dash-layout", timeout=5).status_code == 200
+        except requests.RequestException:
+            ready = False
+        if ready and len(children(process.pid)) >= workers:
+            return
+        time.sleep(0.5)
+    raise RuntimeError(f"gunicorn n'a pas démarré en {boot_timeout}s")
+
+
+def measure(label, env, args):
+    port = free_port()
+    command = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py",
+               "-b", f"127.0.0.1:{port}", "--workers", str(args.workers), "--threads", "1", "app:server"]
+    process = subprocess.Popen(command, cwd=ROOT_DIR, env={**os.environ, "DASH_STARTUP_PROFILE": "0", **env},
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        wait_for_workers(process, base_url, args.workers, args.boot_timeout)
+        # Quelques interactions par worker pour toucher les pages réellement utilisées
+        interactions = build_interactions(discover_regions(base_url, 120))
+        rng = random.Random(0)
+        client = DashClient(base_url, Recorder(), 120)
+        client.http.headers["Connection"] = "close"  # répartit les requêtes sur les workers
+        for _ in range(args.interactions * args.workers):
+            if not client.dependencies and not client.load_page():
+                continue
+            rng.choices([func for _, _, func in interactions],
+                        weights=[weight for _, weight, _ in interactions])[0](client, rng)
+        workers = [memory_kb(pid) for pid in children(process.pid)]
+        master = memory_kb(process.pid)
+    finally:
+        process.terminate()
+        process.wait()
+    return label, master, workers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--interactions", type=int, default=40, help="interactions jouées par worker")
+    parser.add_argument("--boot-timeout", type=float, default=300)
+    args = parser.parse_args()
+
+    results = [measure(label, env, args) for label, env in CONFIGS]
+
+    print(f"\n{args.workers} workers (moyenne par worker, en Mo)")
+    print(f"{'Configuration':<34}{'RSS':>8}{'PSS':>8}{'USS':>8}{'PSS total':>11}")
+    for label, master, workers in results:
+        def mean(field):
+            return statistics.mean(worker[field] for worker in workers) / 1024
+        total = (master["pss"] + sum(worker["pss"] for worker in workers)) / 1024
+        print(f"{label:<34}{mean('rss'):>8.1f}{mean('pss'):>8.1f}{mean('uss'):>8.1f}{total:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
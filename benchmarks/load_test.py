@@ -0,0 +1,346 @@
+"""Générateur de charge : N sessions concurrentes rejouent les interactions du dashboard.
+
+    python benchmarks/load_test.py --users 20 --duration 60
+    python benchmarks/load_test.py --url http://127.0.0.1:8050 --users 50 --think 1.5
+
+Sans ``--url``, le dashboard est démarré localement (``--server-cmd`` pour une autre
+commande de lancement) et arrêté à la fin. Chaque session charge la page
+(``/``, ``/_dash-layout``, ``/_dash-dependencies``) puis enchaîne des interactions
+tirées au hasard, séparées d'un temps de réflexion : changement de cancer ou
+d'indicateur, glisser du curseur des années HPV, lecture (Play) de l'animation, tranche
+d'âge du dépistage, changement de sexe, clic sur une région de la carte, période et pays
+de la frise d'introduction. Les requêtes ``/_dash-update-component`` sont construites
+comme celles du navigateur à partir des dépendances publiées par le serveur ; les
+callbacks exécutés dans le navigateur (``DASH_HPV_ANIMATION=client``) ne génèrent pas
+de requête.
+
+Le rapport donne le débit, les latences p50/p95/p99 et le taux d'erreurs, au total et
+par callback ; ``--json`` les écrit aussi dans un fichier pour comparer deux réglages.
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SERVER_CMD = ("{python} -c \"from app import app; "
+                      "app.run(host='127.0.0.1', port={port}, debug=False, threaded=True)\"")
+
+
+class Recorder:
+    """Résultats de toutes les requêtes, partagés par les sessions."""
+
+    def __init__(self):
+        self.samples = []
+        self._lock = threading.Lock()
+
+    def add(self, name, elapsed, ok, nbytes):
+        with self._lock:
+            self.samples.append((name, elapsed, ok, nbytes, time.perf_counter()))
+
+
+class DashClient:
+    """Une session navigateur : ses cookies, ses connexions et l'état des composants."""
+
+    def __init__(self, base_url, recorder, timeout):
+        self.base_url = base_url.rstrip("/")
+        self.recorder = recorder
+        self.timeout = timeout
+        self.http = requests.Session()
+        self.dependencies = {}
+        self.values = {}
+
+    def get(self, path, name):
+        start = time.perf_counter()
+        try:
+            response = self.http.get(self.base_url + path, timeout=self.timeout)
+            ok = response.status_code == 200
+            nbytes = len(response.content)
+        except requests.RequestException:
+            response, ok, nbytes = None, False, 0
+        self.recorder.add(name, time.perf_counter() - start, ok, nbytes)
+        return response if ok else None
+
+    def load_page(self):
+        self.get("/", "page")
+        layout = self.get("/_dash-layout", "page")
+        dependencies = self.get("/_dash-dependencies", "page")
+        if layout is None or dependencies is None:
+            return False
+        # Seuls les callbacks serveur donnent lieu à une requête
+        self.dependencies = {dep["output"]: dep for dep in dependencies.json()
+                             if not dep.get("clientside_function")}
+        self.values = initial_values(layout.json())
+        return True
+
+    def has_callback(self, output):
+        return output in self.dependencies
+
+    def fire(self, changed):
+        """Met à jour ``{"id.prop": valeur}`` et déclenche les callbacks qui en dépendent."""
+        self.values.update(changed)
+        for output, dep in self.dependencies.items():
+            if any(f"{item['id']}.{item['property']}" in changed for item in dep["inputs"]):
+                self.update(output, dep, list(changed))
+
+    def update(self, output, dep, changed_ids):
+        def with_values(items):
+            return [dict(item, value=self.values.get(f"{item['id']}.{item['property']}")) for item in items]
+
+        outputs = [{"id": part.rsplit(".", 1)[0], "property": part.rsplit(".", 1)[1]}
+                   for part in output.strip(".").split("...")]
+        body = {
+            "output": output,
+            "outputs": outputs if output.startswith("..") else outputs[0],
+            "inputs": with_values(dep["inputs"]),
+            "state": with_values(dep["state"]),
+            "changedPropIds": [prop_id for prop_id in changed_ids
+                               if any(f"{item['id']}.{item['property']}" == prop_id for item in dep["inputs"])],
+        }
+        start = time.perf_counter()
+        try:
+            response = self.http.post(self.base_url + "/_dash-update-component", json=body, timeout=self.timeout)
+            # 204 : PreventUpdate, réponse normale de Dash
+            ok = response.status_code in (200, 204)
+            nbytes = len(response.content)
+        except requests.RequestException:
+            response, ok, nbytes = None, False, 0
+        self.recorder.add(output.strip("."), time.perf_counter() - start, ok, nbytes)
+
+        # Répercute les sorties sur l'état (ex. année par défaut après un changement de sexe)
+        if ok and response.status_code == 200:
+            for component_id, props in response.json().get("response", {}).items():
+                for prop, value in props.items():
+                    if not isinstance(value, dict) or "__dash_patch_update" not in value:
+                        self.values[f"{component_id}.{prop}"] = value
+
+
+def initial_values(layout):
+    """``{"id.prop": valeur}`` pour tous les composants du layout ayant un id."""
+    values = {}
+
+    def walk(node):
+        if isinstance(node, list):
+            for child in node:
+                walk(child)
+        elif isinstance(node, dict):
+            props = node.get("props", {})
+            if "id" in props:
+                for prop, value in props.items():
+                    if prop not in ("id", "children"):
+                        values[f"{props['id']}.{prop}"] = value
+            walk(props.get("children"))
+    walk(layout)
+    return values
+
+
+def options(client, component_id):
+    return [option["value"] if isinstance(option, dict) else option
+            for option in client.values.get(f"{component_id}.options") or []]
+
+
+# Interactions : (nom, poids, fonction(client, rng)). Chaque fonction simule un geste
+# de l'utilisateur, qui peut déclencher plusieurs callbacks.
+
+def change_cancer(client, rng):
+    client.fire({"cancer-dropdown.value": rng.choice(options(client, "cancer-dropdown"))})
+    client.fire({"type-radio.value": rng.choice(["incidence", "mortalite"])})
+
+
+def drag_year_slider(client, rng):
+    years = sorted(int(year) for year in client.values.get("year-slider.marks", {}))
+    start = rng.randrange(len(years))
+    # Le glisser envoie une requête par année traversée
+    for year in years[start:start + rng.randint(2, 6)]:
+        client.fire({"year-slider.value": year})
+
+
+def play_animation(client, rng):
+    n_intervals = client.values.get("interval-component.n_intervals") or 0
+    for _ in range(rng.randint(3, 8)):
+        n_intervals += 1
+        client.fire({"interval-component.n_intervals": n_intervals})
+        if client.has_callback("year-slider.value"):
+            client.fire({"year-slider.value": client.values["year-slider.value"]})
+
+
+def change_age_group(client, rng):
+    client.fire({"age-group-dropdown.value": rng.choice(options(client, "age-group-dropdown"))})
+
+
+def change_sex(client, rng):
+    client.fire({"sex-dropdown.value": rng.choice(["fille", "garcon"])})
+    client.fire({"year-dropdown.value": rng.choice(options(client, "year-dropdown") or [None])})
+
+
+def click_region(client, rng, regions):
+    client.fire({"map.clickData": {"points": [{"location": rng.choice(regions)}]}})
+    client.fire({"close-popup.n_clicks": (client.values.get("close-popup.n_clicks") or 0) + 1})
+
+
+def change_intro(client, rng):
+    low, high = client.values["year-range-slider.min"], client.values["year-range-slider.max"]
+    start = rng.randint(low, high - 1)
+    client.fire({"year-range-slider.value": [start, rng.randint(start + 1, high)]})
+    client.fire({"country-dropdown-intro.value": rng.choice(options(client, "country-dropdown-intro") + [None])})
+
+
+def build_interactions(regions):
+    interactions = [
+        ("cancer", 3, change_cancer),
+        ("hpv_slider", 2, drag_year_slider),
+        ("hpv_play", 1, play_animation),
+        ("depistage", 2, change_age_group),
+        ("sexe", 2, change_sex),
+        ("intro", 1, change_intro),
+    ]
+    if regions:
+        interactions.append(("region", 3, lambda client, rng: click_region(client, rng, regions)))
+    return interactions
+
+
+def discover_regions(base_url, timeout):
+    """Régions cliquables, lues dans la figure renvoyée par la carte de couverture."""
+    client = DashClient(base_url, Recorder(), timeout)
+    if not client.load_page() or not client.has_callback("map.figure"):
+        return []
+    client.fire({"sex-dropdown.value": "fille"})
+    figure = client.values.get("map.figure") or {}
+    return sorted({location for trace in figure.get("data", []) for location in trace.get("locations", [])})
+
+
+def run_session(index, base_url, recorder, interactions, deadline, think, ramp, timeout, seed):
+    rng = random.Random(seed + index)
+    time.sleep(ramp * rng.random())
+    client = DashClient(base_url, recorder, timeout)
+    if not client.load_page():
+        return
+    names, weights, funcs = zip(*interactions)
+    while time.perf_counter() < deadline:
+        func = rng.choices(funcs, weights=weights)[0]
+        try:
+            func(client, rng)
+        except (KeyError, ValueError, IndexError):
+            # Layout inattendu : on passe à l'interaction suivante
+            pass
+        time.sleep(rng.uniform(0, 2 * think))
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[min(int(q * len(sorted_values)), len(sorted_values) - 1)]
+
+
+def summarize(samples, duration):
+    groups = {"total": samples}
+    for sample in samples:
+        groups.setdefault(sample[0], []).append(sample)
+    summary = {}
+    for name, items in groups.items():
+        latencies = sorted(sample[1] for sample in items)
+        errors = sum(1 for sample in items if not sample[2])
+        summary[name] = {
+            "requests": len(items),
+            "rps": len(items) / duration,
+            "p50_ms": percentile(latencies, 0.50) * 1000,
+            "p95_ms": percentile(latencies, 0.95) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000,
+            "error_rate": errors / len(items) if items else 0.0,
+            "mean_bytes": sum(sample[3] for sample in items) / len(items) if items else 0,
+        }
+    return summary
+
+
+def print_summary(summary, users, duration):
+    print(f"\n{users} sessions pendant {duration:.0f}s")
+    print(f"{'Requête':<44}{'Nb':>7}{'Req/s':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'Erreurs':>9}{'Octets':>9}")
+    for name, stats in sorted(summary.items(), key=lambda item: (item[0] == "total", -item[1]["requests"])):
+        print(f"{name:<44}{stats['requests']:>7}{stats['rps']:>8.1f}{stats['p50_ms']:>7.0f}ms"
+              f"{stats['p95_ms']:>7.0f}ms{stats['p99_ms']:>7.0f}ms{stats['error_rate']:>9.1%}"
+              f"{stats['mean_bytes']:>9.0f}")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(command, port, boot_timeout):
+    command = command.format(python=sys.executable, port=port)
+    print(f"Démarrage du dashboard : {command}")
+    process = subprocess.Popen(command, shell=True, cwd=ROOT_DIR,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.perf_counter() + boot_timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"le serveur s'est arrêté au démarrage (code {process.returncode})")
+        try:
+            if requests.get(base_url + "/_dash-layout", timeout=5).status_code == 200:
+                return process, base_url
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError(f"le serveur n'a pas répondu en {boot_timeout}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="serveur déjà démarré (sinon le dashboard est lancé localement)")
+    parser.add_argument("--server-cmd", default=DEFAULT_SERVER_CMD,
+                        help="commande de lancement ({python} et {port} sont remplacés)")
+    parser.add_argument("--users", type=int, default=10, help="sessions concurrentes")
+    parser.add_argument("--duration", type=float, default=30, help="durée du test en secondes")
+    parser.add_argument("--ramp", type=float, default=5, help="étalement du démarrage des sessions")
+    parser.add_argument("--think", type=float, default=1.0, help="temps de réflexion moyen entre deux gestes")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--boot-timeout", type=float, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="écrit le résumé dans ce fichier")
+    args = parser.parse_args()
+
+    process = None
+    base_url = args.url
+    if base_url is None:
+        process, base_url = start_server(args.server_cmd, free_port(), args.boot_timeout)
+    try:
+        interactions = build_interactions(discover_regions(base_url, args.timeout))
+        recorder = Recorder()
+        start = time.perf_counter()
+        deadline = start + args.ramp + args.duration
+        threads = [threading.Thread(target=run_session, daemon=True,
+                                    args=(i, base_url, recorder, interactions, deadline,
+                                          args.think, args.ramp, args.timeout, args.seed))
+                   for i in range(args.users)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # Le débit est calculé une fois toutes les sessions démarrées
+        steady = [sample for sample in recorder.samples if sample[4] >= start + args.ramp]
+        duration = time.perf_counter() - start - args.ramp
+        summary = summarize(steady or recorder.samples, max(duration, 1e-9))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    print_summary(summary, args.users, duration)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"url": args.url, "users": args.users, "duration_s": duration, "think_s": args.think,
+                       "summary": summary}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# Outils de chargement et de service du dashboard (utilisés par app.py)
@@ -0,0 +1,102 @@
+"""Téléchargement concurrent des entrées distantes au démarrage.
+
+Toutes les URL passent par une seule ``requests.Session`` (pool de connexions
+keep-alive) et sont téléchargées en parallèle par un pool de threads borné : le
+temps de démarrage est celui de la source la plus lente, pas la somme. Les
+validateurs renvoyés (``ETag``, ``Last-Modified``) servent ensuite aux requêtes
+conditionnelles du rafraîchissement (``refresh.py``).
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+MAX_WORKERS = 8
+HTTP_TIMEOUT = 30
+
+# Aucun accès réseau (benchmarks, CI) : toute entrée doit exister en local
+OFFLINE = os.environ.get("DASH_OFFLINE", "0") == "1"
+
+_session = None
+_session_lock = threading.Lock()
+
+
+class FetchResult:
+    def __init__(self, name, url, content, elapsed, status=200, etag=None, last_modified=None):
+        self.name = name
+        self.url = url
+        self.content = content
+        self.elapsed = elapsed
+        self.status = status
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @property
+    def nbytes(self):
+        return len(self.content)
+
+    @property
+    def not_modified(self):
+        return self.status == 304
+
+
+def get_session():
+    """Session partagée par tout le process (connexions réutilisées)."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS, max_retries=2)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+    return _session
+
+
+def reset_session():
+    """Oublie la session : un process forké ne doit pas réutiliser les sockets du parent."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+def fetch(name, url, timeout=HTTP_TIMEOUT, etag=None, last_modified=None):
+    """GET de ``url`` ; avec ``etag`` / ``last_modified``, requête conditionnelle (304 sans corps)."""
+    if OFFLINE:
+        raise RuntimeError(f"DASH_OFFLINE=1 : {name} n'est pas disponible en local ({url})")
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    start = time.perf_counter()
+    response = get_session().get(url, timeout=timeout, headers=headers)
+    response.raise_for_status()
+    return FetchResult(name, url, response.content, time.perf_counter() - start, status=response.status_code,
+                       etag=response.headers.get("ETag", etag),
+                       last_modified=response.headers.get("Last-Modified", last_modified))
+
+
+def fetch_all(urls, max_workers=MAX_WORKERS, timeout=HTTP_TIMEOUT, verbose=True):
+    """Télécharge ``{nom: url}`` en parallèle et renvoie ``{nom: FetchResult}``."""
+    if not urls:
+        return {}
+
+    start = time.perf_counter()
+    workers = min(max_workers, len(urls))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fetch") as pool:
+        futures = {name: pool.submit(fetch, name, url, timeout) for name, url in urls.items()}
+        results = {name: future.result() for name, future in futures.items()}
+    total = time.perf_counter() - start
+
+    if verbose:
+        print(f"Téléchargement de {len(results)} sources en {total:.2f}s "
+              f"({sum(r.nbytes for r in results.values()) / 1024:.0f} Ko)")
+        for result in sorted(results.values(), key=lambda r: r.elapsed, reverse=True):
+            print(f"  {result.name:<40} {result.elapsed:6.2f}s {result.nbytes / 1024:8.0f} Ko")
+    return results
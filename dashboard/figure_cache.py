@@ -0,0 +1,150 @@
+"""Cache des figures produites par les callbacks déterministes.
+
+Les entrées de ces callbacks forment un petit ensemble fini (cancer × indicateur,
+année, tranche d'âge, sexe × année de naissance) : une figure déjà construite est
+gardée sous forme de JSON sérialisé et resservie par une simple lecture de dict.
+Le cache est borné (nombre d'entrées et octets) avec éviction LRU. Si un store de
+figures précalculées est branché (``figure_cache.store``, voir ``figure_store.py``),
+une figure absente du cache y est cherchée avant d'être construite. La version des
+données lues par un callback (``version``, voir ``refresh.py``) fait partie de la clé :
+après un rafraîchissement, les anciennes figures ne sont plus servies et sortent du LRU.
+
+    DASH_FIGURE_CACHE=0          désactive le cache
+    DASH_FIGURE_CACHE_SIZE=256   nombre maximal de figures
+    DASH_FIGURE_CACHE_MB=128     taille maximale cumulée du JSON
+    DASH_WARMUP_FIGURES=1        construit toutes les combinaisons au démarrage
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import plotly.io as pio
+
+ENABLED = os.environ.get("DASH_FIGURE_CACHE", "1") != "0"
+WARMUP = os.environ.get("DASH_WARMUP_FIGURES", "0") == "1"
+
+
+class LRUCache:
+    """Dict borné en nombre d'entrées et en taille cumulée des valeurs (``len``)."""
+
+    def __init__(self, maxsize=256, max_bytes=None):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            if key in self._data:
+                self.nbytes -= len(self._data.pop(key))
+            self._data[key] = value
+            self.nbytes += len(value)
+            while self._data and (len(self._data) > self.maxsize
+                                  or (self.max_bytes is not None and self.nbytes > self.max_bytes)):
+                _, evicted = self._data.popitem(last=False)
+                self.nbytes -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.nbytes = 0
+
+
+class FigureCache:
+    """Mémoïsation des callbacks de figures, avec enregistrement de leur espace d'entrées."""
+
+    def __init__(self, maxsize=256, max_bytes=128 * 1024 * 1024, enabled=ENABLED):
+        self.entries = LRUCache(maxsize, max_bytes)
+        self.enabled = enabled
+        # nom -> (fonction mémoïsée, fonction renvoyant toutes les combinaisons d'entrées)
+        self.callbacks = {}
+        # nom -> fonction renvoyant la version des données du callback
+        self.versions = {}
+        self.store = None
+        self.store_hits = 0
+
+    @staticmethod
+    def make_key(name, args):
+        return f"{name}:{json.dumps(args, default=str)}"
+
+    def key(self, name, args):
+        key = self.make_key(name, args)
+        version = self.versions.get(name)
+        return key if version is None else f"{key}@{version()}"
+
+    def memoize(self, name, inputs=None, version=None):
+        """Décorateur à placer sous ``@app.callback``.
+
+        ``inputs`` est une fonction sans argument qui renvoie toutes les combinaisons
+        d'arguments valides ; elle sert au préchauffage. ``version`` renvoie la version
+        des données utilisées par le callback.
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args):
+                if not self.enabled:
+                    return func(*args)
+                key = self.key(name, args)
+                payload = self.entries.get(key)
+                # Lu une seule fois : on_data_refresh peut remettre store à None entre-temps
+                store = self.store
+                if payload is None and store is not None:
+                    payload = store.get(key)
+                    if payload is not None:
+                        self.store_hits += 1
+                        self.entries.set(key, payload)
+                if payload is not None:
+                    return json.loads(payload)
+                figure = func(*args)
+                self.entries.set(key, pio.to_json(figure, validate=False))
+                return figure
+
+            wrapper.uncached = func
+            self.callbacks[name] = (wrapper, inputs)
+            if version is not None:
+                self.versions[name] = version
+            return wrapper
+        return decorator
+
+    def warmup(self, names=None):
+        """Construit et met en cache toutes les figures des callbacks enregistrés."""
+        start = time.perf_counter()
+        count = 0
+        for name, (wrapper, inputs) in self.callbacks.items():
+            if inputs is None or (names is not None and name not in names):
+                continue
+            for args in inputs():
+                wrapper(*args)
+                count += 1
+        print(f"Préchauffage : {count} figures en {time.perf_counter() - start:.1f}s "
+              f"({self.entries.nbytes / 1024 / 1024:.1f} Mo en cache, {self.store_hits} lues dans le store)")
+        return count
+
+
+figure_cache = FigureCache(
+    maxsize=int(os.environ.get("DASH_FIGURE_CACHE_SIZE", "256")),
+    max_bytes=int(float(os.environ.get("DASH_FIGURE_CACHE_MB", "128")) * 1024 * 1024),
+)
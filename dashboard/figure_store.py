@@ -0,0 +1,83 @@
+"""Store sur disque des figures précalculées, versionné par les données et le code.
+
+``python -m dashboard.precompute`` écrit le JSON de chaque figure des callbacks
+mémoïsés dans ``.cache/figures/<version>/`` ; la version est l'empreinte des CSV lus,
+des fichiers qui déterminent les figures (app.py, géométrie) et de la version de
+Plotly. Un serveur démarré sur les mêmes données retrouve donc le même dossier et
+sert ces figures sans les construire ; après une mise à jour des données ou du code,
+la version change et le store est simplement ignoré jusqu'au prochain précalcul.
+
+Le store n'est lu qu'une fois complet (``manifest.json`` écrit en dernier).
+
+    DASH_FIGURE_STORE=0     n'utilise pas le store
+    DASH_FIGURE_STORE_DIR   dossier racine (.cache/figures)
+"""
+import hashlib
+import json
+import os
+import shutil
+
+import plotly
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENABLED = os.environ.get("DASH_FIGURE_STORE", "1") != "0"
+STORE_DIR = os.environ.get("DASH_FIGURE_STORE_DIR", os.path.join(ROOT_DIR, ".cache", "figures"))
+
+# A incrémenter si le format du store change
+STORE_VERSION = 1
+
+
+def data_version(keys, paths=()):
+    """Empreinte des sources (``DataSource.last_key``) et du contenu de ``paths``."""
+    digest = hashlib.sha1(json.dumps([STORE_VERSION, plotly.__version__, sorted(keys)]).encode())
+    for path in paths:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+class FigureStore:
+    def __init__(self, directory, version):
+        self.directory = directory
+        self.version = version
+        self.path = os.path.join(directory, version)
+        self.manifest_path = os.path.join(self.path, "manifest.json")
+        self._complete = None
+
+    def is_complete(self):
+        # Vérifié une fois : un précalcul lancé après le démarrage n'est pris qu'au redémarrage
+        if self._complete is None:
+            self._complete = os.path.exists(self.manifest_path)
+        return self._complete
+
+    def entry_path(self, key):
+        return os.path.join(self.path, hashlib.sha1(key.encode()).hexdigest()[:20] + ".json")
+
+    def get(self, key):
+        if not self.is_complete():
+            return None
+        try:
+            with open(self.entry_path(key), encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key, payload):
+        os.makedirs(self.path, exist_ok=True)
+        path = self.entry_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+    def finish(self, manifest):
+        """Marque le store complet et supprime les versions précédentes."""
+        tmp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+        self._complete = True
+        for entry in os.listdir(self.directory):
+            stale = os.path.join(self.directory, entry)
+            if entry != self.version and os.path.isdir(stale):
+                shutil.rmtree(stale, ignore_errors=True)
@@ -0,0 +1,342 @@
+"""Géométrie des régions françaises pour les cartes de la France.
+
+Le GeoJSON des régions est téléchargé une seule fois, les DOM-TOM sont réduits et
+déplacés en encarts à l'ouest de la métropole, les contours sont simplifiés et
+arrondis, puis le résultat est écrit dans un fichier versionné ``data/geo/`` (non
+suivi par git). Au démarrage, l'app lit simplement ce fichier ; s'il manque, elle le
+construit après avoir téléchargé le GeoJSON, sauf avec ``DASH_OFFLINE=1`` où elle
+s'arrête en indiquant la commande ci-dessous.
+
+Ce GeoJSON est embarqué dans chaque figure des deux cartes de la France : sa taille
+est directement celle des réponses des callbacks. Tolérance et précision se règlent
+avec ``DASH_GEO_TOLERANCE`` (degrés) et ``DASH_GEO_PRECISION`` (décimales).
+
+Construire l'artefact : ``python -m dashboard.geometry [regions.geojson]`` (sans
+argument, le GeoJSON est téléchargé ; sinon le fichier local est utilisé, hors ligne).
+"""
+import json
+import os
+import sys
+from itertools import chain
+
+import numpy as np
+
+from dashboard.fetch import OFFLINE, fetch
+from dashboard.sources import DATA_DIR
+
+REGIONS_URL = "https://france-geojson.gregoiredavid.fr/repo/regions.geojson"
+
+# Simplification (tolérance en degrés) et nombre de décimales conservées
+SIMPLIFY_TOLERANCE = float(os.environ.get("DASH_GEO_TOLERANCE", "0.005"))
+COORD_PRECISION = int(os.environ.get("DASH_GEO_PRECISION", "3"))
+
+# A incrémenter dès que la transformation ci-dessous change
+GEOMETRY_VERSION = 2
+ARTIFACT_PATH = os.path.join(
+    DATA_DIR, "geo",
+    f"regions_encarts_v{GEOMETRY_VERSION}_t{SIMPLIFY_TOLERANCE:g}_p{COORD_PRECISION}.geojson"
+)
+
+# Position (lon, lat) du centre de chaque encart et taille maximale en degrés
+target_positions = {
+    "Guadeloupe": (-8, 49),
+    "Martinique": (-8, 47),
+    "Guyane": (-8, 45),
+    "La Réunion": (-8, 43),
+    "Mayotte": (-8, 41)
+}
+target_dim = 2.0
+
+
+class GeometryArray:
+    """Polygones de toutes les entités stockés dans des tableaux NumPy contigus.
+
+    ``coords`` contient tous les sommets (N, 2) en float64. Les décalages suivent la
+    hiérarchie GeoJSON : ``ring_offsets`` découpe ``coords`` en anneaux,
+    ``polygon_offsets`` découpe les anneaux en polygones et ``feature_offsets`` les
+    polygones en entités. Les entités qui ne sont ni Polygon ni MultiPolygon sont
+    conservées telles quelles (aucun polygone).
+    """
+
+    def __init__(self, coords, ring_offsets, polygon_offsets, feature_offsets, types):
+        self.coords = coords
+        self.ring_offsets = ring_offsets
+        self.polygon_offsets = polygon_offsets
+        self.feature_offsets = feature_offsets
+        self.types = types
+
+    @classmethod
+    def from_features(cls, features):
+        rings, ring_offsets, polygon_offsets, feature_offsets, types = [], [0], [0], [0], []
+        n_points = 0
+        for feature in features:
+            geometry = feature.get("geometry") or {}
+            types.append(geometry.get("type"))
+            if geometry.get("type") == "Polygon":
+                polygons = [geometry["coordinates"]]
+            elif geometry.get("type") == "MultiPolygon":
+                polygons = geometry["coordinates"]
+            else:
+                polygons = []
+            for polygon in polygons:
+                for ring in polygon:
+                    rings.append(ring)
+                    n_points += len(ring)
+                    ring_offsets.append(n_points)
+                polygon_offsets.append(len(ring_offsets) - 1)
+            feature_offsets.append(len(polygon_offsets) - 1)
+
+        points = chain.from_iterable(rings)
+        try:
+            # Un seul passage de conversion pour tous les anneaux (sommets [lon, lat])
+            coords = np.fromiter(chain.from_iterable(points), dtype=np.float64,
+                                 count=2 * n_points).reshape(n_points, 2)
+        except ValueError:
+            # Sommets avec altitude : on ne garde que lon, lat
+            coords = np.array([point[:2] for ring in rings for point in ring],
+                              dtype=np.float64).reshape(n_points, 2)
+        return cls(coords, np.asarray(ring_offsets, dtype=np.int64),
+                   np.asarray(polygon_offsets, dtype=np.int64),
+                   np.asarray(feature_offsets, dtype=np.int64), types)
+
+    def __len__(self):
+        return len(self.types)
+
+    @property
+    def point_offsets(self):
+        """Premier sommet de chaque entité (longueur ``len(self) + 1``)."""
+        return self.ring_offsets[self.polygon_offsets[self.feature_offsets]]
+
+    def bounds(self):
+        """Boîtes englobantes (min_lon, max_lon, min_lat, max_lat) de toutes les entités.
+
+        Les entités sans sommet ont des bornes NaN.
+        """
+        offsets = self.point_offsets
+        counts = np.diff(offsets)
+        result = np.full((len(self), 4), np.nan)
+        non_empty = counts > 0
+        if non_empty.any():
+            starts = offsets[:-1][non_empty]
+            result[non_empty, 0] = np.minimum.reduceat(self.coords[:, 0], starts)
+            result[non_empty, 1] = np.maximum.reduceat(self.coords[:, 0], starts)
+            result[non_empty, 2] = np.minimum.reduceat(self.coords[:, 1], starts)
+            result[non_empty, 3] = np.maximum.reduceat(self.coords[:, 1], starts)
+        return result
+
+    def affine(self, scale, origin, offset, selected=None):
+        """``(p - origin) * scale + offset`` appliqué à chaque entité, en une passe.
+
+        ``scale`` est de forme (F,), ``origin`` et ``offset`` de forme (F, 2).
+        ``selected`` (booléens (F,)) limite la transformation à certaines entités, les
+        autres gardent leurs coordonnées à l'identique.
+        """
+        counts = np.diff(self.point_offsets)
+        points = slice(None) if selected is None else np.repeat(np.asarray(selected, dtype=bool), counts)
+        scale = np.repeat(np.asarray(scale, dtype=np.float64), counts)[:, None][points]
+        origin = np.repeat(np.asarray(origin, dtype=np.float64), counts, axis=0)[points]
+        offset = np.repeat(np.asarray(offset, dtype=np.float64), counts, axis=0)[points]
+        self.coords[points] = (self.coords[points] - origin) * scale + offset
+        return self
+
+    def geometry(self, index):
+        """Reconstruit le dict GeoJSON de l'entité ``index``."""
+        first_polygon, last_polygon = self.feature_offsets[index], self.feature_offsets[index + 1]
+        start = self.ring_offsets[self.polygon_offsets[first_polygon]]
+        end = self.ring_offsets[self.polygon_offsets[last_polygon]]
+        # Conversion en listes limitée aux sommets de cette entité
+        points = self.coords[start:end].tolist()
+        ring_offsets = (self.ring_offsets - start).tolist()
+        polygons = [[points[ring_offsets[r]:ring_offsets[r + 1]]
+                     for r in range(self.polygon_offsets[p], self.polygon_offsets[p + 1])]
+                    for p in range(first_polygon, last_polygon)]
+        if self.types[index] == "Polygon":
+            return {"type": "Polygon", "coordinates": polygons[0]}
+        return {"type": "MultiPolygon", "coordinates": polygons}
+
+    def write_to(self, features, indices=None):
+        """Recopie les coordonnées dans les entités GeoJSON (toutes, ou ``indices``)."""
+        for index in range(len(self)) if indices is None else indices:
+            if self.types[index] in ("Polygon", "MultiPolygon"):
+                features[index]["geometry"] = self.geometry(index)
+        return features
+
+
+def apply_insets(geojson_data):
+    """Réduit les DOM-TOM à ``target_dim`` degrés et les centre sur ``target_positions``."""
+    features = geojson_data["features"]
+    geometries = GeometryArray.from_features(features)
+    bounds = geometries.bounds()
+
+    centers = np.column_stack([(bounds[:, 0] + bounds[:, 1]) / 2, (bounds[:, 2] + bounds[:, 3]) / 2])
+    scale = np.ones(len(features))
+    offset = centers.copy()
+    selected = np.zeros(len(features), dtype=bool)
+
+    for index, feature in enumerate(features):
+        name = feature["properties"]["nom"]
+        if name in target_positions and not np.isnan(bounds[index]).any():
+            current_dim = max(bounds[index, 1] - bounds[index, 0], bounds[index, 3] - bounds[index, 2])
+            scale[index] = target_dim / current_dim if current_dim else 1
+            # La mise à l'échelle autour du centre conserve le centre : le déplacement
+            # vers la cible se fait dans la même transformation affine
+            offset[index] = target_positions[name]
+            selected[index] = True
+
+    geometries.affine(scale, centers, offset, selected)
+    geometries.write_to(features, np.flatnonzero(selected))
+    return geojson_data
+
+
+def _douglas_peucker(points, tolerance):
+    """Indices des sommets conservés de la polyligne ``points`` (k, 2)."""
+    n = len(points)
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        start, end = points[first], points[last]
+        inner = points[first + 1:last]
+        segment = end - start
+        length = np.hypot(segment[0], segment[1])
+        if length == 0:
+            # Arc fermé : distance au point de départ
+            distances = np.hypot(inner[:, 0] - start[0], inner[:, 1] - start[1])
+        else:
+            distances = np.abs(segment[0] * (inner[:, 1] - start[1])
+                               - segment[1] * (inner[:, 0] - start[0])) / length
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            index = first + 1 + farthest
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+    return np.flatnonzero(keep)
+
+
+def simplify_geojson(geojson_data, tolerance=SIMPLIFY_TOLERANCE, precision=COORD_PRECISION):
+    """Simplifie (Douglas-Peucker) et arrondit les polygones sans casser la topologie.
+
+    Les anneaux sont découpés en arcs aux sommets où l'ensemble des régions voisines
+    change ; une frontière commune à deux régions est donc un seul arc, simplifié
+    une seule fois et réutilisé (éventuellement inversé) par les deux régions. Un
+    anneau qui deviendrait dégénéré est conservé tel quel.
+    """
+    features = geojson_data["features"]
+    geometries = GeometryArray.from_features(features)
+    if not len(geometries.coords):
+        return geojson_data
+
+    # Sommets uniques, et régions qui contiennent chacun d'eux
+    vertices, vertex_ids = np.unique(geometries.coords, axis=0, return_inverse=True)
+    vertex_ids = vertex_ids.reshape(-1)
+    feature_ids = np.repeat(np.arange(len(features)), np.diff(geometries.point_offsets))
+    pairs = np.unique(np.column_stack([vertex_ids, feature_ids]), axis=0)
+    starts = np.flatnonzero(np.r_[True, pairs[1:, 0] != pairs[:-1, 0]])
+    # Signature (nombre, min, max) : exacte pour 1 ou 2 régions, jonction au-delà
+    signature = np.column_stack([np.diff(np.r_[starts, len(pairs)]),
+                                 np.minimum.reduceat(pairs[:, 1], starts),
+                                 np.maximum.reduceat(pairs[:, 1], starts)])
+    rounded = np.round(vertices, precision)
+    simplified_arcs = {}
+
+    def simplify_arc(arc):
+        key = tuple(arc.tolist())
+        if key in simplified_arcs:
+            return simplified_arcs[key]
+        if key[::-1] in simplified_arcs:
+            return simplified_arcs[key[::-1]][::-1]
+        kept = arc[_douglas_peucker(vertices[arc], tolerance)]
+        simplified_arcs[key] = kept
+        return kept
+
+    new_rings = []
+    for r in range(len(geometries.ring_offsets) - 1):
+        ring = vertex_ids[geometries.ring_offsets[r]:geometries.ring_offsets[r + 1]]
+        open_ring = ring[:-1] if len(ring) > 1 and ring[0] == ring[-1] else ring
+        if len(open_ring) < 4:
+            new_rings.append(rounded[ring])
+            continue
+
+        sig = signature[open_ring]
+        junction = ((sig[:, 0] > 2)
+                    | (sig != np.roll(sig, 1, axis=0)).any(axis=1)
+                    | (sig != np.roll(sig, -1, axis=0)).any(axis=1))
+        if not junction.any():
+            # Aucun changement de voisin : départ canonique au plus petit sommet
+            junction[np.argmin(open_ring)] = True
+
+        # Arcs entre jonctions successives (parcours circulaire, extrémités incluses)
+        nodes = np.flatnonzero(junction)
+        cycle = np.roll(open_ring, -nodes[0])
+        cycle = np.r_[cycle, cycle[:1]]
+        bounds = np.r_[nodes - nodes[0], len(open_ring)]
+        kept = [cycle[:1]] + [simplify_arc(cycle[a:b + 1])[1:] for a, b in zip(bounds[:-1], bounds[1:])]
+
+        points = rounded[np.concatenate(kept)]
+        # L'arrondi peut créer des doublons consécutifs
+        points = points[np.r_[True, (points[1:] != points[:-1]).any(axis=1)]]
+        new_rings.append(points if len(points) >= 4 else rounded[ring])
+
+    geometries.coords = np.concatenate(new_rings)
+    geometries.ring_offsets = np.r_[0, np.cumsum([len(ring) for ring in new_rings])].astype(np.int64)
+    geometries.write_to(features)
+    return geojson_data
+
+
+def geojson_size(geojson_data):
+    """Taille en octets du GeoJSON tel qu'envoyé dans chaque figure."""
+    return len(json.dumps(geojson_data, separators=(",", ":")))
+
+
+def artifact_exists():
+    return os.path.exists(ARTIFACT_PATH)
+
+
+def remote_urls():
+    """Entrées à télécharger au démarrage : le GeoJSON brut, seulement si l'artefact manque."""
+    if artifact_exists():
+        return {}
+    if OFFLINE:
+        raise RuntimeError(f"DASH_OFFLINE=1 : l'artefact {ARTIFACT_PATH} manque, le construire avec "
+                           "`python -m dashboard.geometry` (ou `python -m dashboard.geometry regions.geojson` "
+                           "depuis un fichier local)")
+    return {"regions_geojson": REGIONS_URL}
+
+
+def build_france_regions(raw=None):
+    """Télécharge (si ``raw`` est absent) et transforme le GeoJSON, puis écrit l'artefact."""
+    if raw is None:
+        raw = fetch("regions_geojson", REGIONS_URL).content
+    geojson_data = apply_insets(json.loads(raw))
+    size_before = geojson_size(geojson_data)
+    geojson_data = simplify_geojson(geojson_data)
+    print(f"GeoJSON des régions : {size_before / 1024:.0f} Ko -> {geojson_size(geojson_data) / 1024:.0f} Ko "
+          f"(tolérance {SIMPLIFY_TOLERANCE:g}°, {COORD_PRECISION} décimales)")
+
+    os.makedirs(os.path.dirname(ARTIFACT_PATH), exist_ok=True)
+    tmp_path = f"{ARTIFACT_PATH}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(geojson_data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, ARTIFACT_PATH)
+    return geojson_data
+
+
+def load_france_regions(raw=None):
+    """GeoJSON des régions avec encarts DOM-TOM, construit seulement s'il manque."""
+    if artifact_exists():
+        with open(ARTIFACT_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    return build_france_regions(raw)
+
+
+if __name__ == "__main__":
+    raw = None
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "rb") as f:
+            raw = f.read()
+    data = build_france_regions(raw)
+    print(f"{len(data['features'])} régions écrites dans {ARTIFACT_PATH}")
@@ -0,0 +1,30 @@
+"""Table dense pays × année de la couverture vaccinale HPV (données OWID).
+
+La carte HPV affiche les pays de gapminder (codes ISO) : chaque année doit les contenir
+tous, dans le même ordre, un pays sans donnée valant 0. ``prepare_hpv_data`` construit
+cette grille par un produit cartésien années × pays suivi d'une seule jointure
+(``benchmarks/bench_prepare_hpv.py`` la compare à l'ancienne boucle année par année).
+"""
+import pandas as pd
+import plotly.express as px
+
+
+def gapminder_iso_map():
+    """{nom du pays: code ISO alpha-3} des pays de gapminder."""
+    iso_map = px.data.gapminder()[['country', 'iso_alpha']].drop_duplicates()
+    return dict(zip(iso_map.country, iso_map.iso_alpha))
+
+
+def prepare_hpv_data(df, iso_map):
+    # Table dense pays × année : produit cartésien puis une seule jointure
+    all_countries = pd.DataFrame({
+        'Entity': list(iso_map.keys()),
+        'Code': list(iso_map.values())
+    })
+    years = pd.DataFrame({'Year': df['Year'].unique()})
+    grid = years.merge(all_countries, how='cross')
+
+    merged = grid.merge(df, on=['Year', 'Entity', 'Code'], how='left')
+    merged['_3_b_1__sh_acs_hpv'] = merged['_3_b_1__sh_acs_hpv'].fillna(0)
+    columns = ['Entity', 'Code'] + [col for col in df.columns if col not in ('Entity', 'Code')]
+    return merged[columns].astype({'Entity': 'category', 'Code': 'category'})
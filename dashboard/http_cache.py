@@ -0,0 +1,113 @@
+"""Compression et validateurs HTTP des réponses JSON de Dash.
+
+``response_compressor.instrument(server)`` ajoute un hook ``after_request`` sur
+``/_dash-update-component``, ``/_dash-layout`` et ``/_dash-dependencies`` :
+
+- le corps est compressé en brotli ou gzip selon ``Accept-Encoding`` (au-delà de
+  ``DASH_COMPRESS_MIN_BYTES``). Les figures servies par le cache produisent toujours le
+  même JSON : la version compressée est gardée dans un LRU indexé par l'empreinte du
+  corps, une figure n'est donc compressée qu'une fois ;
+- chaque réponse porte un ETag fort, calculé sur le JSON et suffixé par l'encodage
+  (deux représentations différentes n'ont jamais le même ETag) ;
+- sur les GET (layout, dépendances, en ``Cache-Control: no-cache``), un
+  ``If-None-Match`` qui correspond renvoie un 304 sans corps. Les callbacks sont des
+  POST : le navigateur n'y envoie pas de requête conditionnelle et la RFC 9110 interdit
+  d'y répondre 304, ils ne bénéficient donc que de la compression.
+
+    DASH_COMPRESS=0              désactive compression et ETags
+    DASH_COMPRESS_MIN_BYTES=1024 taille minimale compressée
+    DASH_COMPRESS_CACHE_MB=32    taille maximale du cache des corps compressés
+"""
+import gzip
+import hashlib
+import os
+
+import flask
+
+from dashboard.figure_cache import LRUCache
+
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+ENABLED = os.environ.get("DASH_COMPRESS", "1") != "0"
+PATHS = ("/_dash-update-component", "/_dash-layout", "/_dash-dependencies")
+SUFFIXES = {"br": "br", "gzip": "gz"}
+
+
+class ResponseCompressor:
+    def __init__(self, min_bytes=1024, cache_bytes=32 * 1024 * 1024, gzip_level=6, brotli_quality=5):
+        self.min_bytes = min_bytes
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.cache = LRUCache(maxsize=4096, max_bytes=cache_bytes)
+
+    def negotiate(self, accept_encoding):
+        """Meilleur encodage accepté par le client (``br`` puis ``gzip``), ou None."""
+        accepted = {}
+        for item in accept_encoding.split(","):
+            name, _, params = item.strip().partition(";")
+            quality = 1.0
+            if params.strip().startswith("q="):
+                try:
+                    quality = float(params.strip()[2:])
+                except ValueError:
+                    quality = 0.0
+            accepted[name.strip().lower()] = quality
+        for encoding in ("br", "gzip"):
+            if encoding == "br" and not HAS_BROTLI:
+                continue
+            if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+                return encoding
+        return None
+
+    def compress(self, body, digest, encoding):
+        key = (digest, encoding)
+        data = self.cache.get(key)
+        if data is None:
+            if encoding == "br":
+                data = brotli.compress(body, quality=self.brotli_quality)
+            else:
+                data = gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+            self.cache.set(key, data)
+        return data
+
+    def process(self, response):
+        request = flask.request
+        if request.path not in PATHS or response.status_code != 200 or response.direct_passthrough:
+            return response
+
+        body = response.get_data()
+        digest = hashlib.sha1(body).hexdigest()[:20]
+        encoding = self.negotiate(request.headers.get("Accept-Encoding", "")) \
+            if len(body) >= self.min_bytes else None
+        etag = f"{digest}-{SUFFIXES[encoding]}" if encoding else digest
+        response.vary.add("Accept-Encoding")
+
+        if request.method in ("GET", "HEAD"):
+            response.headers["Cache-Control"] = "no-cache"
+            # Même JSON quel que soit l'encodage demandé : tout ETag de ce corps est valide
+            if any(tag.split("-")[0] == digest for tag in request.if_none_match.as_set()):
+                not_modified = flask.Response(status=304)
+                not_modified.set_etag(etag)
+                not_modified.headers["Cache-Control"] = "no-cache"
+                not_modified.vary.add("Accept-Encoding")
+                return not_modified
+
+        if encoding:
+            response.set_data(self.compress(body, digest, encoding))
+            response.headers["Content-Encoding"] = encoding
+        response.set_etag(etag)
+        return response
+
+    def instrument(self, server):
+        server.after_request(self.process)
+        return server
+
+
+response_compressor = ResponseCompressor(
+    min_bytes=int(os.environ.get("DASH_COMPRESS_MIN_BYTES", "1024")),
+    cache_bytes=int(os.environ.get("DASH_COMPRESS_CACHE_MB", "32")) * 1024 * 1024,
+)
@@ -0,0 +1,195 @@
+"""Images de l'animation du virus servies par l'application elle-même.
+
+Les PNG de ``src/image_dash`` sont redimensionnés à leur taille d'affichage (1x et 2x)
+et déclinés en AVIF, WebP et PNG dans ``assets/img/``, sous des noms contenant
+l'empreinte du contenu. Une image modifiée change donc d'URL, ce qui permet de les
+servir avec un cache navigateur d'un an (``Cache-Control: immutable``).
+
+``picture()`` renvoie un ``html.Picture`` : le navigateur choisit le format et la
+largeur qu'il sait afficher. ``manifest.json`` garde la liste des fichiers produits ;
+il est reconstruit au démarrage si une image source ou un réglage change, ou
+explicitement avec ``python -m dashboard.images``. Sans Pillow, les PNG d'origine sont
+copiés tels quels (toujours servis en local, avec le même cache).
+"""
+import hashlib
+import json
+import os
+import shutil
+
+import flask
+from dash import html
+
+try:
+    from PIL import Image, features
+    HAS_PILLOW = True
+except ImportError:
+    HAS_PILLOW = False
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_DIR = os.path.join(ROOT_DIR, "src", "image_dash")
+ASSETS_DIR = os.path.join(ROOT_DIR, "assets")
+OUTPUT_DIR = os.path.join(ASSETS_DIR, "img")
+MANIFEST_PATH = os.path.join(OUTPUT_DIR, "manifest.json")
+URL_PREFIX = "/assets/img/"
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# A incrémenter si l'encodage change (qualité, formats…)
+IMAGES_VERSION = 1
+QUALITY = {"avif": 55, "webp": 80}
+
+# Largeurs d'affichage en pixels CSS (1x) : le virus occupe ~15vw, les maladies ~8vw
+# d'un écran de 1920 px ; la variante 2x sert les écrans haute densité
+IMAGES = {
+    "1_papilomavirus(1).png": 288,
+    "1_cancer_anal(6).png": 160,
+    "1_cancer_Oropharynx(3).png": 160,
+    "1_cancer_penis(4).png": 160,
+    "1_cancer_vagin(5).png": 160,
+}
+SIZES = {
+    "1_papilomavirus(1).png": "15vw",
+}
+DEFAULT_SIZES = "8vw"
+
+
+def available_formats():
+    if not HAS_PILLOW:
+        return []
+    return [fmt for fmt in ("avif", "webp") if features.check(fmt)] + ["png"]
+
+
+def source_key(name, width):
+    digest = hashlib.sha1()
+    with open(os.path.join(SOURCE_DIR, name), "rb") as f:
+        digest.update(f.read())
+    digest.update(json.dumps([width, IMAGES_VERSION, QUALITY, available_formats()]).encode())
+    return digest.hexdigest()[:10]
+
+
+def _stem(name):
+    # "1_cancer_anal(6).png" -> "1_cancer_anal_6" (sans parenthèses dans les URL)
+    base = os.path.splitext(name)[0]
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in base).strip("_")
+
+
+def _encode(image, path, fmt):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if fmt == "png":
+        image.save(tmp_path, "PNG", optimize=True)
+    else:
+        image.save(tmp_path, fmt.upper(), quality=QUALITY[fmt])
+    # Plusieurs workers peuvent construire les images en même temps
+    os.replace(tmp_path, path)
+
+
+def build_image(name, width):
+    """Écrit les variantes d'une image et renvoie son entrée du manifeste."""
+    key = source_key(name, width)
+    stem = _stem(name)
+    source_path = os.path.join(SOURCE_DIR, name)
+    entry = {"key": key, "variants": {}, "width": width}
+
+    if not HAS_PILLOW:
+        filename = f"{stem}.{key}.png"
+        tmp_path = os.path.join(OUTPUT_DIR, f"{filename}.{os.getpid()}.tmp")
+        shutil.copyfile(source_path, tmp_path)
+        os.replace(tmp_path, os.path.join(OUTPUT_DIR, filename))
+        entry["variants"]["png"] = [[filename, None]]
+        return entry
+
+    with Image.open(source_path) as original:
+        original.load()
+        entry["height"] = round(original.height * width / original.width)
+        for fmt in available_formats():
+            files = []
+            # Jamais d'agrandissement : la 2x est plafonnée à la taille d'origine
+            for target in sorted({min(width, original.width), min(2 * width, original.width)}):
+                image = original if target == original.width else original.resize(
+                    (target, round(original.height * target / original.width)), Image.LANCZOS)
+                filename = f"{stem}.{key}.{target}w.{fmt}"
+                _encode(image, os.path.join(OUTPUT_DIR, filename), fmt)
+                files.append([filename, target])
+            entry["variants"][fmt] = files
+    return entry
+
+
+def load_manifest():
+    if not os.path.exists(MANIFEST_PATH):
+        return {}
+    with open(MANIFEST_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def build_images(force=False):
+    """Produit les variantes manquantes ou périmées, supprime les anciennes, écrit le manifeste."""
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    manifest = load_manifest()
+    changed = False
+    for name, width in IMAGES.items():
+        entry = manifest.get(name)
+        if force or entry is None or entry["key"] != source_key(name, width):
+            manifest[name] = build_image(name, width)
+            changed = True
+
+    if changed:
+        keep = {filename for entry in manifest.values()
+                for files in entry["variants"].values() for filename, _ in files}
+        for filename in os.listdir(OUTPUT_DIR):
+            if filename != "manifest.json" and filename not in keep and not filename.endswith(".tmp"):
+                os.remove(os.path.join(OUTPUT_DIR, filename))
+        tmp_path = f"{MANIFEST_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, MANIFEST_PATH)
+    return manifest
+
+
+def _srcset(files):
+    return ", ".join(f"{URL_PREFIX}{filename} {width}w" if width else f"{URL_PREFIX}{filename}"
+                     for filename, width in files)
+
+
+def picture(manifest, name, style, alt=""):
+    """``html.Picture`` AVIF / WebP / PNG pour une image de ``IMAGES``."""
+    entry = manifest[name]
+    variants = entry["variants"]
+    sizes = SIZES.get(name, DEFAULT_SIZES)
+    fallback = variants["png"]
+    sources = [html.Source(srcSet=_srcset(variants[fmt]), type=f"image/{fmt}", sizes=sizes)
+               for fmt in ("avif", "webp") if fmt in variants]
+    img = html.Img(
+        src=f"{URL_PREFIX}{fallback[0][0]}",
+        srcSet=_srcset(fallback) if fallback[0][1] else None,
+        sizes=sizes if fallback[0][1] else None,
+        width=entry.get("width"),
+        height=entry.get("height"),
+        alt=alt,
+        style=style,
+    )
+    return html.Picture(sources + [img])
+
+
+def add_cache_headers(server):
+    """Cache navigateur d'un an pour les images à nom versionné."""
+    @server.after_request
+    def cache_hashed_images(response):
+        path = flask.request.path
+        if path.startswith(URL_PREFIX) and not path.endswith(".json") and response.status_code in (200, 304):
+            response.headers["Cache-Control"] = CACHE_CONTROL
+        return response
+    return server
+
+
+def report(manifest):
+    sources = sum(os.path.getsize(os.path.join(SOURCE_DIR, name)) for name in manifest)
+    print(f"Images sources : {sources / 1024:.0f} Ko")
+    for fmt in ("avif", "webp", "png"):
+        files = [files[0][0] for entry in manifest.values() for kind, files in entry["variants"].items()
+                 if kind == fmt]
+        if files:
+            total = sum(os.path.getsize(os.path.join(OUTPUT_DIR, filename)) for filename in files)
+            print(f"  {fmt:<5} 1x : {total / 1024:6.0f} Ko")
+
+
+if __name__ == "__main__":
+    report(build_images(force=True))
@@ -0,0 +1,171 @@
+"""Mesures par callback Dash exposées au format texte Prometheus.
+
+``callback_metrics.instrument(app)`` remplace ``app.callback`` : chaque callback
+serveur enregistré ensuite est chronométré (nombre d'appels, latences, erreurs) et
+la taille de sa réponse JSON est relevée avant les hooks ``after_request`` de l'app,
+donc avant la compression : elle ne dépend pas de ``Accept-Encoding``. ``GET /metrics`` renvoie
+les compteurs et les quantiles p50/p95/p99 calculés sur les derniers appels.
+
+Les mesures sont propres à chaque process (label ``worker``) : avec plusieurs
+workers, Prometheus doit interroger chacun d'eux ou agréger par ``worker``.
+
+    DASH_METRICS=0        désactive l'instrumentation et l'endpoint
+    DASH_METRICS_WINDOW   nombre d'appels conservés pour les quantiles (2048)
+"""
+import functools
+import os
+import threading
+import time
+from collections import deque
+
+import flask
+from dash.dependencies import Output
+from dash.exceptions import PreventUpdate
+
+ENABLED = os.environ.get("DASH_METRICS", "1") != "0"
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class CallbackStats:
+    def __init__(self, window):
+        self.calls = 0
+        self.errors = 0
+        self.latency_sum = 0.0
+        self.bytes_sum = 0
+        self.bytes_count = 0
+        self.latencies = deque(maxlen=window)
+        self.sizes = deque(maxlen=window)
+
+
+class CallbackMetrics:
+    def __init__(self, window=2048, path="/metrics"):
+        self.window = window
+        self.path = path
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key):
+        with self._lock:
+            if key not in self.stats:
+                self.stats[key] = CallbackStats(self.window)
+            return self.stats[key]
+
+    def record_call(self, key, elapsed, error=False):
+        stats = self._get(key)
+        with self._lock:
+            stats.calls += 1
+            stats.latency_sum += elapsed
+            stats.latencies.append(elapsed)
+            if error:
+                stats.errors += 1
+
+    def record_size(self, key, nbytes):
+        stats = self._get(key)
+        with self._lock:
+            stats.bytes_sum += nbytes
+            stats.bytes_count += 1
+            stats.sizes.append(nbytes)
+
+    def timed(self, key, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if flask.has_request_context():
+                # Exécuté avant les hooks after_request (compression comprise) : taille du JSON brut
+                flask.after_this_request(functools.partial(self.record_response_size, key))
+            start = time.perf_counter()
+            error = False
+            try:
+                return func(*args, **kwargs)
+            except PreventUpdate:
+                raise
+            except Exception:
+                error = True
+                raise
+            finally:
+                self.record_call(key, time.perf_counter() - start, error)
+        return wrapper
+
+    def instrument(self, app):
+        original_callback = app.callback
+
+        def callback(*args, **kwargs):
+            decorator = original_callback(*args, **kwargs)
+            outputs = _find_outputs(list(args) + list(kwargs.values()))
+            output = f"{outputs[0].component_id}.{outputs[0].component_property}" if outputs else ""
+
+            def register(func):
+                return decorator(self.timed((func.__name__, output), func))
+            return register
+
+        app.callback = callback
+        app.server.add_url_rule(self.path, "dash_callback_metrics", self.render)
+        return app
+
+    def record_response_size(self, key, response):
+        if not response.direct_passthrough:
+            self.record_size(key, response.calculate_content_length() or 0)
+        return response
+
+    def render(self):
+        # content_type tel quel : avec mimetype, Flask ajouterait un second charset
+        return flask.Response(self.prometheus_text(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+    def prometheus_text(self):
+        worker = os.getpid()
+        lines = [
+            "# HELP dash_callback_latency_seconds Callback latency (quantiles over the last calls).",
+            "# TYPE dash_callback_latency_seconds summary",
+        ]
+        with self._lock:
+            snapshot = {key: (stats.calls, stats.errors, stats.latency_sum, sorted(stats.latencies),
+                              stats.bytes_sum, stats.bytes_count, sorted(stats.sizes))
+                        for key, stats in self.stats.items()}
+
+        def labels(key, **extra):
+            name, output = key
+            items = {"callback": name, "output": output, "worker": worker, **extra}
+            return "{" + ",".join(f'{k}="{v}"' for k, v in items.items()) + "}"
+
+        for key, (calls, _, latency_sum, latencies, *_) in snapshot.items():
+            for q in QUANTILES:
+                lines.append(f"dash_callback_latency_seconds{labels(key, quantile=q)} {_quantile(latencies, q):.6f}")
+            lines.append(f"dash_callback_latency_seconds_sum{labels(key)} {latency_sum:.6f}")
+            lines.append(f"dash_callback_latency_seconds_count{labels(key)} {calls}")
+
+        lines += [
+            "# HELP dash_callback_response_bytes Serialized callback response size.",
+            "# TYPE dash_callback_response_bytes summary",
+        ]
+        for key, (*_, bytes_sum, bytes_count, sizes) in snapshot.items():
+            for q in QUANTILES:
+                lines.append(f"dash_callback_response_bytes{labels(key, quantile=q)} {_quantile(sizes, q):.0f}")
+            lines.append(f"dash_callback_response_bytes_sum{labels(key)} {bytes_sum}")
+            lines.append(f"dash_callback_response_bytes_count{labels(key)} {bytes_count}")
+
+        lines += [
+            "# HELP dash_callback_errors_total Callbacks that raised an exception.",
+            "# TYPE dash_callback_errors_total counter",
+        ]
+        for key, (_, errors, *_) in snapshot.items():
+            lines.append(f"dash_callback_errors_total{labels(key)} {errors}")
+        return "\n".join(lines) + "\n"
+
+
+def _find_outputs(values):
+    outputs = []
+    for value in values:
+        if isinstance(value, Output):
+            outputs.append(value)
+        elif isinstance(value, (list, tuple)):
+            outputs += _find_outputs(value)
+    return outputs
+
+
+def _quantile(sorted_values, q):
+    if not sorted_values:
+        return float("nan")  # écrit « nan », accepté par Prometheus
+    index = min(int(q * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+callback_metrics = CallbackMetrics(window=int(os.environ.get("DASH_METRICS_WINDOW", "2048")))
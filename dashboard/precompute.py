@@ -0,0 +1,80 @@
+"""Précalcul de toutes les figures des callbacks mémoïsés, en parallèle.
+
+    python -m dashboard.precompute [--workers 4]
+
+Les données sont chargées une seule fois (import d'app.py), puis chaque combinaison
+d'entrées déclarée par ``figure_cache.memoize(..., inputs=...)`` — carte des cancers,
+carte HPV de chaque année, dépistage, couverture vaccinale — est construite dans un
+pool de process et écrite dans le store versionné (``dashboard/figure_store.py``).
+Les serveurs démarrés ensuite sur les mêmes données servent ces figures sans les
+construire. A lancer au déploiement, après chaque mise à jour des données ou du code.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import plotly.io as pio
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _load_app():
+    # Les process forkés héritent du module déjà importé ; sinon il est rechargé une fois
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+    import app
+    return app
+
+
+def _render(task):
+    name, args = task
+    app = _load_app()
+    wrapper, _ = app.figure_cache.callbacks[name]
+    start = time.perf_counter()
+    payload = pio.to_json(wrapper.uncached(*args), validate=False)
+    app.figure_cache.store.put(app.figure_cache.key(name, args), payload)
+    return name, len(payload), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    os.environ["DASH_WARMUP_FIGURES"] = "0"
+    os.environ["DASH_FIGURE_STORE"] = "1"
+    start = time.perf_counter()
+    app = _load_app()
+    store = app.figure_cache.store
+    load_time = time.perf_counter() - start
+
+    tasks = [(name, tuple(combination))
+             for name, (_, inputs) in app.figure_cache.callbacks.items() if inputs is not None
+             for combination in inputs()]
+    context = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else None)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=context, initializer=_load_app) as pool:
+        results = list(pool.map(_render, tasks, chunksize=max(1, len(tasks) // (4 * args.workers))))
+    elapsed = time.perf_counter() - start
+
+    summary = {}
+    for name, nbytes, render_time in results:
+        count, total_bytes, total_time = summary.get(name, (0, 0, 0.0))
+        summary[name] = (count + 1, total_bytes + nbytes, total_time + render_time)
+    store.finish({
+        "version": store.version,
+        "figures": len(results),
+        "callbacks": {name: count for name, (count, _, _) in summary.items()},
+    })
+
+    print(f"Données chargées en {load_time:.1f}s ; {len(results)} figures en {elapsed:.1f}s "
+          f"avec {args.workers} process -> {store.path}")
+    for name, (count, total_bytes, total_time) in summary.items():
+        print(f"  {name:<26}{count:>4} figures {total_bytes / 1024:>8.0f} Ko {total_time:>7.1f}s de calcul")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Profilage du démarrage : temps, octets lus, lignes et mémoire par étape.
+
+app.py fait tout son travail à l'import ; chaque étape de chargement est encadrée
+par ``startup.begin("nom")`` et le tableau récapitulatif est affiché à la fin.
+
+    DASH_STARTUP_PROFILE=1             temps, octets et lignes (par défaut)
+    DASH_STARTUP_PROFILE=memory        ajoute le pic et la mémoire retenue (tracemalloc,
+                                       qui ralentit nettement le démarrage)
+    DASH_STARTUP_PROFILE=0             désactive le profilage
+    DASH_STARTUP_PROFILE_JSON=fichier  écrit aussi les mesures en JSON
+"""
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class Phase:
+    def __init__(self, name):
+        self.name = name
+        self.wall = 0.0
+        self.nbytes = 0
+        self.rows = 0
+        self.peak = None
+        self.retained = None
+
+    def add(self, nbytes=0, rows=0):
+        self.nbytes += nbytes
+        self.rows += rows
+
+    def as_dict(self):
+        return {"phase": self.name, "wall_s": round(self.wall, 4), "bytes": self.nbytes,
+                "rows": self.rows, "peak_bytes": self.peak, "retained_bytes": self.retained}
+
+
+class StartupProfiler:
+    def __init__(self, enabled=True, trace_memory=False, json_path=None):
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self.json_path = json_path
+        self.phases = []
+        self.current = None
+        self._start = None
+        self._memory_before = 0
+        self._started_tracing = False
+        self._created = time.perf_counter()
+
+    def begin(self, name):
+        """Termine l'étape en cours et commence ``name``."""
+        self.end()
+        self.current = Phase(name)
+        if not self.enabled:
+            return self.current
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            tracemalloc.reset_peak()
+            self._memory_before = tracemalloc.get_traced_memory()[0]
+        self._start = time.perf_counter()
+        return self.current
+
+    def end(self):
+        phase, self.current = self.current, None
+        if phase is None or not self.enabled:
+            return phase
+        phase.wall = time.perf_counter() - self._start
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            phase.peak = max(peak - self._memory_before, 0)
+            phase.retained = current - self._memory_before
+        self.phases.append(phase)
+        return phase
+
+    @contextmanager
+    def phase(self, name):
+        phase = self.begin(name)
+        try:
+            yield phase
+        finally:
+            self.end()
+
+    def add(self, nbytes=0, rows=0):
+        """Ajoute des octets lus / lignes parsées à l'étape en cours."""
+        if self.current is not None:
+            self.current.add(nbytes, rows)
+
+    def as_dict(self):
+        return {
+            "total_s": round(sum(phase.wall for phase in self.phases), 4),
+            "process_s": round(time.perf_counter() - self._created, 4),
+            "phases": [phase.as_dict() for phase in self.phases],
+        }
+
+    def report(self):
+        lines = [f"{'Étape':<38}{'Temps':>9}{'Octets':>11}{'Lignes':>9}{'Pic mém.':>11}{'Retenu':>11}"]
+        for phase in self.phases:
+            lines.append(f"{phase.name:<38}{phase.wall * 1000:>7.0f}ms{_size(phase.nbytes):>11}"
+                         f"{phase.rows:>9}{_size(phase.peak):>11}{_size(phase.retained):>11}")
+        total = sum(phase.wall for phase in self.phases)
+        retained = sum(phase.retained for phase in self.phases) if self.trace_memory else None
+        lines.append(f"{'Total':<38}{total * 1000:>7.0f}ms{'':>31}{_size(retained):>11}")
+        return "\n".join(lines)
+
+    def finish(self):
+        """Affiche le tableau, écrit le JSON si demandé et arrête tracemalloc."""
+        self.end()
+        if not self.enabled:
+            return
+        # Les reconstructions ultérieures (rafraîchissement des données) ne sont plus mesurées
+        self.enabled = False
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        print(self.report())
+        if self.json_path:
+            with open(self.json_path, "w", encoding="utf-8") as f:
+                json.dump(self.as_dict(), f, indent=2, ensure_ascii=False)
+
+
+def _size(nbytes):
+    if nbytes is None:
+        return "-"
+    if abs(nbytes) >= 1024 * 1024:
+        return f"{nbytes / 1024 / 1024:.1f} Mo"
+    return f"{nbytes / 1024:.0f} Ko"
+
+
+startup = StartupProfiler(
+    enabled=os.environ.get("DASH_STARTUP_PROFILE", "1") != "0",
+    trace_memory=os.environ.get("DASH_STARTUP_PROFILE") == "memory",
+    json_path=os.environ.get("DASH_STARTUP_PROFILE_JSON"),
+)
@@ -0,0 +1,162 @@
+"""Rafraîchissement des données en arrière-plan, sans redémarrer les workers.
+
+Les tables dérivées des CSV (tranches des cancers, grille HPV, couvertures…) forment
+un ``Snapshot`` qui n'est jamais modifié une fois publié. Chaque groupe de tables est
+déclaré avec ses sources et la fonction qui le construit. Dans chaque process, un thread
+revalide les sources à intervalle régulier (``DataSource.revalidate`` : date et taille
+en local, requête conditionnelle à distance). Seuls les groupes dont une source a changé
+sont reconstruits, hors du chemin des requêtes. Le nouveau snapshot remplace ensuite
+l'ancien par une simple affectation de référence.
+
+Une requête lit un seul snapshot du début à la fin : ``current()`` le fixe dans
+``flask.g`` au premier accès. Chaque groupe a son numéro de version, qui entre dans la
+clé des figures en cache : les figures d'un groupe inchangé restent valides.
+
+    DASH_REFRESH_SECONDS=0   intervalle de revalidation en secondes (0 : désactivé)
+"""
+import os
+import threading
+import time
+import traceback
+
+import flask
+
+INTERVAL = float(os.environ.get("DASH_REFRESH_SECONDS", "0"))
+
+
+class Snapshot:
+    """Tables d'une version des données, accessibles en attributs (``snapshot.df_hpv``)."""
+
+    def __init__(self, tables, versions, version=1):
+        self.tables = tables
+        # groupe -> version (incrémentée à chaque reconstruction du groupe)
+        self.versions = versions
+        self.version = version
+        self.created = time.time()
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__["tables"][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+class DataRefresher:
+    def __init__(self, interval=INTERVAL):
+        self.interval = interval
+        # (nom du groupe, sources, fonction {nom de source: contenu brut} -> {nom: table})
+        self.groups = []
+        self.snapshot = None
+        self.listeners = []
+        self.refreshes = 0
+        self._refresh_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._pid = None
+
+    def add_group(self, name, sources, build):
+        self.groups.append((name, list(sources), build))
+
+    def load(self, raw_inputs):
+        """Construit et publie le premier snapshot (au démarrage)."""
+        tables = {}
+        for _, _, build in self.groups:
+            tables.update(build(raw_inputs))
+        self.snapshot = Snapshot(tables, {name: 1 for name, _, _ in self.groups})
+        return self.snapshot
+
+    def current(self):
+        """Snapshot de la requête en cours (le même jusqu'à sa fin), sinon le plus récent."""
+        if not flask.has_request_context():
+            return self.snapshot
+        snapshot = flask.g.get("data_snapshot")
+        if snapshot is None:
+            snapshot = flask.g.data_snapshot = self.snapshot
+        return snapshot
+
+    def version(self, group):
+        """Fonction renvoyant la version courante d'un groupe (clé du cache de figures)."""
+        return lambda: self.current().versions[group]
+
+    def changed_sources(self):
+        changed = {}
+        for _, sources, _ in self.groups:
+            for source in sources:
+                try:
+                    raw = source.revalidate()
+                except Exception as exc:
+                    # Source injoignable : on garde la version en place
+                    print(f"Rafraîchissement : {source.name} non revalidée ({exc})")
+                    continue
+                if raw is not None:
+                    changed[source.name] = raw
+        return changed
+
+    def refresh(self):
+        """Revalide les sources, reconstruit les groupes modifiés et publie le nouveau snapshot.
+
+        Renvoie la liste des groupes reconstruits.
+        """
+        with self._refresh_lock:
+            changed = self.changed_sources()
+            if not changed:
+                return []
+
+            previous = self.snapshot
+            tables = dict(previous.tables)
+            versions = dict(previous.versions)
+            rebuilt = []
+            for name, sources, build in self.groups:
+                if not any(source.name in changed for source in sources):
+                    continue
+                raws = {source.name: changed.get(source.name, source.last_raw) for source in sources}
+                try:
+                    tables.update(build(raws))
+                except Exception:
+                    # Fichier en cours d'écriture, colonnes inattendues… : l'ancien groupe reste servi
+                    print(f"Rafraîchissement : groupe {name} non reconstruit")
+                    traceback.print_exc()
+                    for source in sources:
+                        source.forget()
+                    continue
+                versions[name] += 1
+                rebuilt.append(name)
+
+            if rebuilt:
+                self.snapshot = Snapshot(tables, versions, previous.version + 1)
+                self.refreshes += 1
+                for listener in self.listeners:
+                    listener(self.snapshot, rebuilt)
+            return rebuilt
+
+    def start(self):
+        """Démarre le thread de revalidation du process courant (une seule fois par process).
+
+        Appelé à la première requête : avec gunicorn, chaque worker forké a son propre thread.
+        """
+        if self.interval <= 0 or self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            threading.Thread(target=self._run, name="data-refresh", daemon=True).start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            start = time.perf_counter()
+            try:
+                rebuilt = self.refresh()
+            except Exception:
+                traceback.print_exc()
+                continue
+            if rebuilt:
+                print(f"Données rafraîchies (pid {os.getpid()}) : {', '.join(rebuilt)} "
+                      f"en {time.perf_counter() - start:.2f}s, snapshot v{self.snapshot.version}")
+
+    def instrument(self, server):
+        server.before_request(self.start)
+        return server
+
+
+data_refresher = DataRefresher()
@@ -0,0 +1,85 @@
+"""Tables préparées partagées entre workers par des fichiers Arrow IPC mappés en mémoire.
+
+``shared_tables.share("nom", df)`` écrit la table une seule fois dans ``.cache/shared/``
+(nom + empreinte du contenu) puis la relit via ``mmap`` : les colonnes numériques sans
+valeurs manquantes pointent directement dans le fichier, dont les pages sont partagées
+par tous les process via le cache du système. La mémoire résidente n'augmente donc
+plus avec le nombre de workers, même sans ``preload_app`` ou après le redémarrage d'un
+worker. Les colonnes texte restent des objets Python propres à chaque process.
+
+Les DataFrames renvoyés sont en lecture seule : toute préparation (renommage,
+corrections, conversions) doit être faite avant ``share``.
+
+Désactivé par défaut : avec ``preload_app`` les workers partagent déjà les tables par
+fork, et les tables actuelles (moins d'1 Mo au total) ne changent pas la mémoire par
+worker (voir ``benchmarks/bench_worker_rss.py``). A activer si les jeux de données
+grossissent ou si les workers ne sont pas forkés depuis un maître préchargé.
+
+    DASH_SHARED_TABLES=1   active le partage (sinon chaque process garde ses copies)
+    DASH_SHARED_DIR        dossier des fichiers Arrow (.cache/shared)
+"""
+import glob
+import hashlib
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    HAS_ARROW = True
+except ImportError:
+    HAS_ARROW = False
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENABLED = os.environ.get("DASH_SHARED_TABLES", "0") == "1"
+SHARED_DIR = os.environ.get("DASH_SHARED_DIR", os.path.join(ROOT_DIR, ".cache", "shared"))
+
+
+class SharedTables:
+    def __init__(self, directory, enabled=True):
+        self.directory = directory
+        self.enabled = enabled and HAS_ARROW
+        self.paths = {}
+
+    def content_key(self, df):
+        digest = hashlib.sha1()
+        digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode())
+        digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+        return digest.hexdigest()[:16]
+
+    def path(self, name, key):
+        return os.path.join(self.directory, f"{name}-{key}.arrow")
+
+    def share(self, name, df):
+        """Renvoie ``df`` adossé au fichier Arrow mappé (écrit s'il n'existe pas encore)."""
+        if not self.enabled:
+            return df
+        path = self.path(name, self.content_key(df))
+        if not os.path.exists(path):
+            self._write(name, path, pa.Table.from_pandas(df))
+        self.paths[name] = path
+        return self.read(path)
+
+    def read(self, path):
+        source = pa.memory_map(path, "r")
+        table = pa.ipc.open_file(source).read_all()
+        # split_blocks : une colonne par bloc, sans consolidation (donc sans copie)
+        return table.to_pandas(split_blocks=True)
+
+    def _write(self, name, path, table):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        # Remplacement atomique : un autre worker peut lire le fichier au même moment
+        os.replace(tmp_path, path)
+        for stale in glob.glob(os.path.join(self.directory, f"{name}-*.arrow")):
+            if stale != path:
+                os.remove(stale)
+
+    def nbytes(self):
+        return sum(os.path.getsize(path) for path in self.paths.values())
+
+
+shared_tables = SharedTables(SHARED_DIR, enabled=ENABLED)
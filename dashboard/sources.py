@@ -0,0 +1,192 @@
+"""Sources de données du dashboard.
+
+Chaque jeu de données est résolu d'abord vers la copie locale du dossier ``data/``
+et, à défaut, vers le dépôt GitHub distant. Les DataFrames lus sont gardés dans un
+cache colonnaire (Parquet) dont la clé est le hash du contenu brut : un CSV modifié
+produit une nouvelle entrée, les démarrages suivants ne font que de l'I/O locale.
+
+``revalidate()`` indique si une source a changé depuis sa dernière lecture : taille et
+date de modification pour un fichier local, requête conditionnelle pour une source
+distante, puis comparaison de l'empreinte du contenu.
+"""
+import hashlib
+import io
+import json
+import os
+
+import pandas as pd
+
+from dashboard.fetch import fetch, fetch_all, HTTP_TIMEOUT
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(ROOT_DIR, "data")
+CACHE_DIR = os.environ.get("DASH_CACHE_DIR", os.path.join(ROOT_DIR, ".cache", "datasets"))
+REMOTE_BASE_URL = "https://raw.githubusercontent.com/badis2203/dash_board_projet_zitouni/main/data"
+
+# Forcer la lecture distante (ex : déploiement sans le dossier data/)
+PREFER_REMOTE = os.environ.get("DASH_PREFER_REMOTE", "0") == "1"
+
+# A incrémenter si le format des fichiers de cache change
+CACHE_VERSION = 1
+
+
+class DataSource:
+    """Un fichier CSV du dossier ``data/`` et la façon de le lire.
+
+    ``read_kwargs`` est passé à ``pd.read_csv`` (``usecols``, ``dtype``…) ; ``decimals``
+    arrondit les colonnes numériques à la précision affichée dès la lecture.
+    """
+
+    def __init__(self, name, path, decimals=None, **read_kwargs):
+        self.name = name
+        self.path = path
+        self.decimals = decimals
+        self.read_kwargs = read_kwargs
+        self.last_nbytes = 0
+        self.last_key = None
+        # Validateurs de la dernière lecture : (mtime, taille) en local, ETag / Last-Modified à distance
+        self.last_stat = None
+        self.etag = None
+        self.last_modified = None
+        # Contenu distant gardé pour reconstruire un groupe sans retélécharger les sources inchangées
+        self.last_raw = None
+
+    def __repr__(self):
+        return f"DataSource({self.name!r}, {self.path!r})"
+
+    @property
+    def local_path(self):
+        return os.path.join(DATA_DIR, *self.path.split("/"))
+
+    @property
+    def url(self):
+        return f"{REMOTE_BASE_URL}/{self.path}"
+
+    def is_local(self):
+        return not PREFER_REMOTE and os.path.exists(self.local_path)
+
+    def local_stat(self):
+        stat = os.stat(self.local_path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def read_bytes(self):
+        if self.is_local():
+            self.last_stat = self.local_stat()
+            with open(self.local_path, "rb") as f:
+                return f.read()
+        result = fetch(self.name, self.url, timeout=HTTP_TIMEOUT)
+        self.remember(result)
+        return result.content
+
+    def remember(self, result):
+        """Garde les validateurs et le contenu d'un téléchargement (``FetchResult``)."""
+        self.etag = result.etag
+        self.last_modified = result.last_modified
+        self.last_raw = result.content
+
+    def forget(self):
+        """Oublie les validateurs : la prochaine revalidation renverra le contenu actuel."""
+        self.last_key = None
+        self.last_stat = None
+        self.etag = None
+        self.last_modified = None
+
+    def revalidate(self):
+        """Contenu brut si la source a changé depuis le dernier ``load``, sinon None."""
+        if self.is_local():
+            if self.local_stat() == self.last_stat:
+                return None
+            raw = self.read_bytes()
+        else:
+            result = fetch(self.name, self.url, timeout=HTTP_TIMEOUT,
+                           etag=self.etag, last_modified=self.last_modified)
+            if result.not_modified:
+                return None
+            self.remember(result)
+            raw = result.content
+        # Fichier réécrit ou ETag changé avec un contenu identique
+        if self.cache_key(raw) == self.last_key:
+            return None
+        return raw
+
+    def cache_key(self, raw):
+        h = hashlib.sha1(raw)
+        h.update(json.dumps([self.read_kwargs, self.decimals], sort_keys=True, default=str).encode())
+        h.update(str(CACHE_VERSION).encode())
+        return h.hexdigest()[:16]
+
+    def cache_path(self, key):
+        return os.path.join(CACHE_DIR, f"{self.name}-{key}.parquet")
+
+    def parse(self, raw):
+        df = pd.read_csv(io.BytesIO(raw), **self.read_kwargs)
+        if self.decimals is not None:
+            # round() garde le dtype (float32 compris)
+            df = df.round(self.decimals)
+        return df
+
+    def load(self, raw=None):
+        if raw is None:
+            raw = self.read_bytes()
+        # Octets lus pour ce chargement (suivi du démarrage)
+        self.last_nbytes = len(raw)
+        # Empreinte du contenu lu (version des données, ex : store des figures)
+        self.last_key = self.cache_key(raw)
+        if not HAS_PARQUET:
+            return self.parse(raw)
+
+        path = self.cache_path(self.last_key)
+        if os.path.exists(path):
+            try:
+                return pd.read_parquet(path)
+            except Exception:
+                # Fichier tronqué ou illisible : on relit le CSV
+                pass
+
+        df = self.parse(raw)
+        self._write_cache(df, path)
+        return df
+
+    def _write_cache(self, df, path):
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            df.to_parquet(tmp_path, index=False)
+            # Remplacement atomique : plusieurs process peuvent écrire en même temps
+            os.replace(tmp_path, path)
+        except Exception:
+            # Le cache est une optimisation, une colonne non sérialisable ne doit pas bloquer
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        # Supprimer les anciennes versions de ce jeu de données
+        prefix = f"{self.name}-"
+        for entry in os.listdir(CACHE_DIR):
+            stale = os.path.join(CACHE_DIR, entry)
+            if entry.startswith(prefix) and entry.endswith(".parquet") and stale != path:
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+
+
+def fetch_remote(sources, extra_urls=None):
+    """Télécharge en une seule passe concurrente les sources absentes en local.
+
+    ``extra_urls`` ajoute d'autres entrées distantes (ex : le GeoJSON des régions).
+    Renvoie ``{nom: contenu brut}`` à passer ensuite à ``DataSource.load``.
+    """
+    remote = {source.name: source for source in sources if not source.is_local()}
+    urls = {name: source.url for name, source in remote.items()}
+    urls.update(extra_urls or {})
+    results = fetch_all(urls)
+    for name, source in remote.items():
+        source.remember(results[name])
+    return {name: result.content for name, result in results.items()}
@@ -0,0 +1,37 @@
+# Configuration gunicorn du dashboard :  gunicorn -c gunicorn.conf.py app:server
+#
+# Les données sont chargées une seule fois dans le process maître (preload_app), puis les
+# workers sont forkés et partagent ces pages mémoire en copy-on-write. gc.freeze() juste
+# avant le fork sort ces objets du ramasse-miettes : sans cela, chaque collecte écrit dans
+# leurs en-têtes et recopie peu à peu toutes les pages dans chaque worker.
+#
+#   PORT                port d'écoute (5000)
+#   WEB_CONCURRENCY     nombre de workers (nombre de cœurs)
+#   GUNICORN_THREADS    threads par worker (4)
+#   GUNICORN_TIMEOUT    délai maximal d'une requête en secondes (60)
+#   GUNICORN_PRELOAD=0  charge les données dans chaque worker (pas de partage par fork)
+import gc
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+worker_class = "gthread"
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 60))
+graceful_timeout = 30
+keepalive = 5
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1") != "0"
+accesslog = "-"
+
+
+def when_ready(server):
+    # Appelé après le chargement de l'application dans le maître, avant le premier fork
+    gc.collect()
+    gc.freeze()
+    server.log.info("Données chargées, %d objets gelés avant le fork", gc.get_freeze_count())
+
+
+def post_fork(server, worker):
+    from dashboard.fetch import reset_session
+    reset_session()
@@ -0,0 +1,428 @@
+"""Extraction des tableaux GCO (Global Cancer Observatory) : 8 cancers × incidence / mortalité.
+
+Remplace les 16 scripts ``2_<cancer>_<indicateur>.py`` : la table ``CANCERS`` associe le
+nom utilisé dans ``data/2_cancers/`` au code GCO, ``METRICS`` l'indicateur au paramètre
+``types``. Les pages sont ouvertes par un pool de navigateurs Chrome headless réutilisés
+(``--workers``) ; chaque extraction attend que le tableau soit rempli (``WebDriverWait``)
+au lieu d'un ``time.sleep(5)``. Les CSV sont écrits directement dans ``data/2_cancers/``,
+par remplacement atomique (le dashboard peut les relire pendant l'extraction).
+
+Le tableau est récupéré en un seul appel WebDriver (``outerHTML``) puis analysé dans le
+process (lxml s'il est installé, sinon ``html.parser``), au lieu d'un aller-retour par
+ligne et par cellule (``--extract cells``, l'ancienne méthode). Les colonnes numériques
+sont typées (séparateurs de milliers retirés) ; population et code ISO restent du texte.
+
+    python scraping_code/2_scrap_cancers/2_scrap_gco.py                  # les 16 tableaux
+    python scraping_code/2_scrap_cancers/2_scrap_gco.py --only anus col  # une partie
+    python scraping_code/2_scrap_cancers/2_scrap_gco.py --record --fixtures fixtures/gco
+    python scraping_code/2_scrap_cancers/2_scrap_gco.py --fixtures fixtures/gco --output-dir /tmp/gco
+
+``--record`` enregistre le HTML de chaque page chargée dans le dossier ``--fixtures``. Sans
+``--record``, ``--fixtures`` démarre un serveur HTTP local qui rejoue ces pages à la place
+du site GCO (tests hors ligne) ; ``--base-url`` vise un autre serveur de remplacement.
+
+Dépendances : ``selenium`` (4.6 ou plus, qui installe lui-même le ChromeDriver), ``lxml``
+en option. ``benchmarks/bench_gco_extract.py`` compare les deux modes d'extraction.
+"""
+import argparse
+import http.server
+from html.parser import HTMLParser
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+try:
+    import lxml.html
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+OUTPUT_DIR = os.path.join(ROOT_DIR, "data", "2_cancers")
+
+GCO_BASE_URL = "https://gco.iarc.fr"
+TABLES_PATH = "/today/en/dataviz/tables"
+
+# Nom du jeu de données (data/2_cancers/2_<nom>_<indicateur>.csv) -> code cancer GCO
+CANCERS = {
+    "anus": 10,
+    "oral_cavite": 1,
+    "col": 23,
+    "larynx": 14,
+    "oropharynx": 3,
+    "penis": 26,
+    "vagin": 22,
+    "vulva": 21,
+}
+METRICS = {
+    "incidence": 0,
+    "mortalite": 1,
+}
+
+POPULATIONS = (
+    "100_104_108_112_116_12_120_124_132_140_144_148_152_160_170_174_178_180_188_191_192_196_203_204_208_"
+    "214_218_222_226_231_232_233_24_242_246_250_254_258_262_266_268_270_275_276_288_300_31_312_316_32_320_"
+    "324_328_332_340_348_352_356_36_360_364_368_372_376_380_384_388_392_398_4_40_400_404_408_410_414_417_"
+    "418_422_426_428_430_434_44_440_442_450_454_458_462_466_470_474_478_48_480_484_496_498_499_50_504_508_"
+    "51_512_516_52_524_528_540_548_554_558_56_562_566_578_586_591_598_600_604_608_616_620_624_626_630_634_"
+    "638_64_642_643_646_662_678_68_682_686_688_694_70_702_703_704_705_706_710_716_72_724_728_729_740_748_"
+    "752_756_76_760_762_764_768_780_784_788_792_795_8_800_804_807_818_826_834_84_840_854_858_860_862_882_"
+    "887_894_90_96"
+)
+
+# Colonnes gardées en texte (le code ISO a des zéros en tête : "004")
+TEXT_COLUMNS = ("Population", "Population code (ISO/UN)")
+
+
+def table_url(base_url, cancer, metric):
+    return (f"{base_url}{TABLES_PATH}?mode=population&cancers={CANCERS[cancer]}&sexes=0&key=crude_rate"
+            f"&age_end=17&multiple_cancers=0&populations={POPULATIONS}&types={METRICS[metric]}")
+
+
+def fixture_name(cancer, metric):
+    return f"2_{cancer}_{metric}.html"
+
+
+def make_driver(page_timeout):
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1280,1024")
+    # Les images ne servent pas au tableau
+    options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    # Rend la main dès le DOM prêt : le tableau est de toute façon attendu explicitement
+    options.page_load_strategy = "eager"
+    driver = webdriver.Chrome(options=options)
+    driver.set_page_load_timeout(page_timeout)
+    return driver
+
+
+class DriverPool:
+    """Navigateurs réutilisés d'une page à l'autre, créés à la demande (``size`` au plus)."""
+
+    def __init__(self, size, page_timeout=60):
+        self.size = size
+        self.page_timeout = page_timeout
+        self.created = 0
+        self._idle = queue.Queue()
+        self._all = []
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                can_create = self.created < self.size
+                if can_create:
+                    self.created += 1
+            if can_create:
+                try:
+                    driver = make_driver(self.page_timeout)
+                except Exception:
+                    with self._lock:
+                        self.created -= 1
+                    raise
+                with self._lock:
+                    self._all.append(driver)
+                return driver
+            # Tous les navigateurs sont occupés : attendre qu'un soit rendu (ou fermé)
+            try:
+                return self._idle.get(timeout=1)
+            except queue.Empty:
+                continue
+
+    def release(self, driver):
+        self._idle.put(driver)
+
+    def discard(self, driver):
+        """Ferme un navigateur en erreur ; le suivant sera recréé à la demande."""
+        with self._lock:
+            self.created -= 1
+            if driver in self._all:
+                self._all.remove(driver)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
+    def close(self):
+        with self._lock:
+            drivers, self._all = self._all, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass
+
+
+def table_ready(driver):
+    """Condition d'attente : le tableau existe et contient au moins une ligne de données."""
+    tables = driver.find_elements(By.TAG_NAME, "table")
+    if tables and tables[0].find_elements(By.CSS_SELECTOR, "tr td"):
+        return tables[0]
+    return False
+
+
+def read_cells(table):
+    """Ancienne extraction : un appel WebDriver par ligne et par cellule."""
+    headers = table.find_elements(By.TAG_NAME, "th")
+    column_names = [header.text.strip() for header in headers]
+
+    rows = []
+    for row in table.find_elements(By.TAG_NAME, "tr")[1:]:  # Sauter la ligne d'en-têtes
+        cols = row.find_elements(By.TAG_NAME, "td")
+        if cols:
+            rows.append([col.text.strip() for col in cols])
+    return column_names, rows
+
+
+def _text(value):
+    # Espaces regroupés comme dans le texte affiché (WebElement.text)
+    return " ".join(value.split())
+
+
+class TableParser(HTMLParser):
+    """Premier ``<table>`` d'un document : textes des ``<th>`` et lignes de ``<td>``."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.headers = []
+        self.rows = []
+        self.done = False
+        self._depth = 0
+        self._row = None
+        self._cell = None
+        self._cell_tag = None
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == "table":
+            self._depth += 1
+        elif self._depth == 1:
+            if tag == "tr":
+                self._row = []
+            elif tag in ("td", "th"):
+                self._cell = []
+                self._cell_tag = tag
+            elif tag == "br" and self._cell is not None:
+                self._cell.append(" ")
+
+    def handle_endtag(self, tag):
+        if self.done or not self._depth:
+            return
+        if tag == "table":
+            self._depth -= 1
+            self.done = self._depth == 0
+        elif self._depth == 1:
+            if tag in ("td", "th") and self._cell is not None:
+                text = _text("".join(self._cell))
+                if self._cell_tag == "th":
+                    self.headers.append(text)
+                elif self._row is not None:
+                    self._row.append(text)
+                self._cell = None
+            elif tag == "tr" and self._row is not None:
+                if self._row:
+                    self.rows.append(self._row)
+                self._row = None
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+
+
+def parse_table_html(html, use_lxml=HAS_LXML):
+    """(en-têtes, lignes) du premier tableau de ``html`` (tableau seul ou page entière)."""
+    if use_lxml:
+        root = lxml.html.fromstring(html)
+        table = root if root.tag == "table" else root.find(".//table")
+        if table is None:
+            return [], []
+        headers = [_text(th.text_content()) for th in table.iter("th")]
+        rows = [[_text(td.text_content()) for td in tr.findall("td")] for tr in table.iter("tr")]
+        return headers, [row for row in rows if row]
+
+    parser = TableParser()
+    parser.feed(html)
+    parser.close()
+    return parser.headers, parser.rows
+
+
+def typed_frame(headers, rows):
+    """DataFrame typé : entiers (nullable) ou flottants, sauf ``TEXT_COLUMNS``."""
+    df = pd.DataFrame(rows, columns=headers)
+    for col in df.columns:
+        if col in TEXT_COLUMNS:
+            continue
+        # "3 138" -> 3138 (espaces, insécables compris) ; cellule vide -> valeur manquante
+        values = df[col].str.replace(r"\s+", "", regex=True).replace("", None)
+        numbers = pd.to_numeric(values, errors="coerce")
+        if numbers.isna().sum() != values.isna().sum():
+            # Colonne non numérique : gardée telle quelle
+            continue
+        if values.dropna().str.contains(".", regex=False).any():
+            df[col] = numbers.astype("float64")
+        else:
+            df[col] = numbers.astype("Int64")
+    return df
+
+
+def read_table(table, mode="html"):
+    if mode == "cells":
+        headers, rows = read_cells(table)
+    else:
+        # Un seul aller-retour WebDriver pour tout le tableau
+        headers, rows = parse_table_html(table.get_attribute("outerHTML"))
+    return typed_frame(headers, rows)
+
+
+def write_csv(df, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def write_fixture(html, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(html)
+
+
+def extract(pool, base_url, cancer, metric, output_dir, timeout, record_dir=None, mode="html", retries=1):
+    """Charge une page, attend le tableau, écrit le CSV. Renvoie (nb de lignes, durée)."""
+    start = time.perf_counter()
+    for attempt in range(retries + 1):
+        driver = pool.acquire()
+        healthy = False
+        try:
+            driver.get(table_url(base_url, cancer, metric))
+            table = WebDriverWait(driver, timeout, poll_frequency=0.1).until(table_ready)
+            # Le navigateur a répondu : il retourne au pool même si la suite échoue
+            healthy = True
+            df = read_table(table, mode)
+            if record_dir:
+                write_fixture(driver.page_source, os.path.join(record_dir, fixture_name(cancer, metric)))
+        except (TimeoutException, WebDriverException):
+            # Navigateur planté ou page jamais remplie : nouvelle tentative sur un navigateur neuf
+            healthy = False
+            if attempt == retries:
+                raise
+            continue
+        finally:
+            # Chaque navigateur acquis est rendu ou fermé, quelle que soit l'erreur
+            if healthy:
+                pool.release(driver)
+            else:
+                pool.discard(driver)
+        break
+
+    write_csv(df, os.path.join(output_dir, f"2_{cancer}_{metric}.csv"))
+    return len(df), time.perf_counter() - start
+
+
+class FixtureHandler(http.server.BaseHTTPRequestHandler):
+    """Rejoue les pages enregistrées : ``cancers`` / ``types`` de l'URL -> fichier du dossier."""
+
+    directory = None
+    names = {(code, metric_code): (cancer, metric)
+             for cancer, code in CANCERS.items() for metric, metric_code in METRICS.items()}
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        try:
+            key = (int(query["cancers"][0]), int(query["types"][0]))
+            path = os.path.join(self.directory, fixture_name(*self.names[key]))
+            with open(path, "rb") as f:
+                body = f.read()
+        except (KeyError, ValueError, OSError):
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_fixtures(directory):
+    """Démarre le serveur de remplacement sur un port libre et renvoie son URL de base."""
+    handler = type("Handler", (FixtureHandler,), {"directory": os.path.abspath(directory)})
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, name="gco-fixtures", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", choices=sorted(CANCERS), help="cancers à extraire (tous par défaut)")
+    parser.add_argument("--metrics", nargs="+", choices=sorted(METRICS), default=list(METRICS))
+    parser.add_argument("--workers", type=int, default=4, help="navigateurs en parallèle")
+    parser.add_argument("--timeout", type=float, default=30, help="attente maximale du tableau (s)")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--base-url", default=None, help=f"site à interroger ({GCO_BASE_URL})")
+    parser.add_argument("--fixtures", default=None, help="dossier des pages enregistrées")
+    parser.add_argument("--record", action="store_true", help="enregistre les pages dans --fixtures")
+    parser.add_argument("--extract", choices=["html", "cells"], default="html",
+                        help="html : tableau lu en un appel ; cells : un appel par cellule")
+    args = parser.parse_args()
+
+    if args.record and not args.fixtures:
+        parser.error("--record demande --fixtures")
+
+    server = None
+    base_url = args.base_url or GCO_BASE_URL
+    if args.fixtures and not args.record:
+        server, base_url = serve_fixtures(args.fixtures)
+    record_dir = args.fixtures if args.record else None
+
+    tasks = [(cancer, metric) for cancer in (args.only or CANCERS) for metric in args.metrics]
+    pool = DriverPool(min(args.workers, len(tasks)), page_timeout=max(args.timeout, 30))
+    start = time.perf_counter()
+    failures = 0
+    try:
+        with ThreadPoolExecutor(max_workers=pool.size, thread_name_prefix="gco") as executor:
+            futures = {executor.submit(extract, pool, base_url, cancer, metric, args.output_dir,
+                                       args.timeout, record_dir, args.extract): (cancer, metric)
+                       for cancer, metric in tasks}
+            for future in as_completed(futures):
+                cancer, metric = futures[future]
+                try:
+                    rows, elapsed = future.result()
+                except Exception as exc:
+                    failures += 1
+                    print(f"  {cancer:<12} {metric:<10} ÉCHEC : {exc.__class__.__name__} {exc}".rstrip())
+                    continue
+                print(f"  {cancer:<12} {metric:<10} {rows:>5} lignes {elapsed:6.2f}s")
+    finally:
+        pool.close()
+        if server is not None:
+            server.shutdown()
+
+    print(f"{len(tasks) - failures}/{len(tasks)} tableaux en {time.perf_counter() - start:.1f}s "
+          f"({pool.size} navigateurs) -> {os.path.abspath(args.output_dir)}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
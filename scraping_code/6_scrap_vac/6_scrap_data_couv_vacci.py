@@ -1,73 +1,164 @@
-import requests
-from bs4 import BeautifulSoup
-import os
-import pandas as pd
+"""Couverture vaccinale HPV à 16 ans par région (Santé publique France), filles et garçons.
 
-# 📍 Définir le chemin absolu pour stocker les fichiers CSV
-save_folder = "/Users/badisbensalem/Desktop/dash_board_projet_zitouni/donnees_vaccination"
+Les classeurs XLSX liés depuis la page de Santé publique France sont lus directement en
+mémoire depuis la réponse HTTP (openpyxl en lecture seule, ligne par ligne) : pas de
+fichier XLSX ni de CSV intermédiaire. La ligne d'en-tête ("Année de naissance" suivie des
+années) est détectée dans la feuille, puis le nettoyage est appliqué au fil des lignes :
+noms de régions corrigés, "-" remplacé par 0.0, années "2001.0" -> "2001". Le résultat
+est écrit tel que app.py le lit :
 
-# 📂 Créer le dossier s'il n'existe pas
-os.makedirs(save_folder, exist_ok=True)
+    data/6_donnees_vac_pap/6_couverture_vaccinale_2023_filles_nettoye.csv
+    data/6_donnees_vac_pap/6_couverture_vaccinale_2023_garcons_nettoye.csv
 
-# 🌐 URL de la page contenant les fichiers
-url = "https://www.santepubliquefrance.fr/determinants-de-sante/vaccination/articles/donnees-infra-nationales-de-couverture-vaccinale-papillomavirus-humains-hpv"
-
-# 🔽 Télécharger la page
-response = requests.get(url)
+Dépendances : requests, beautifulsoup4, openpyxl.
+"""
+import io
+import os
+import re
 
-if response.status_code == 200:
-    print("✅ Page téléchargée avec succès.")
+import pandas as pd
+import requests
+from bs4 import BeautifulSoup
+from openpyxl import load_workbook
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+OUTPUT_DIR = os.path.join(ROOT_DIR, "data", "6_donnees_vac_pap")
+
+BASE_URL = "https://www.santepubliquefrance.fr"
+PAGE_URL = (f"{BASE_URL}/determinants-de-sante/vaccination/articles/"
+            "donnees-infra-nationales-de-couverture-vaccinale-papillomavirus-humains-hpv")
+YEAR = "2023"
+
+# Libellé du lien -> suffixe du fichier
+SEXES = {
+    "jeunes filles": "filles",
+    "jeunes garçons": "garcons",
+}
+
+# Noms des régions de Santé publique France -> noms du GeoJSON des régions
+CORRECTIONS_REGIONS = {
+    "Auvergne - Rhône-Alpes": "Auvergne-Rhône-Alpes",
+    "Bourgogne - Franche - Comté": "Bourgogne-Franche-Comté",
+    "Centre": "Centre-Val de Loire",
+    "Grand-Est": "Grand Est",
+    "Ile de France": "Île-de-France",
+    "Nouvelle Aquitaine": "Nouvelle-Aquitaine",
+    "Paca": "Provence-Alpes-Côte d'Azur",
+}
+
+HEADER_LABEL = "année de naissance"
+
+
+def _label(value):
+    # "Hauts-de-\nFrance" -> "Hauts-de-France", "Année de\nnaissance" -> "Année de naissance"
+    text = re.sub(r"-\s*\n\s*", "-", str(value))
+    return " ".join(text.split())
+
+
+def _year(value):
+    """Année de naissance d'une cellule d'en-tête (1995, 2001.0, "2006"), sinon None."""
+    try:
+        year = float(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+    if year.is_integer() and 1900 <= year <= 2100:
+        return str(int(year))
+    return None
+
+
+def _rate(value):
+    """Taux d'une cellule : nombre, "-" (pas de donnée, DROM avant 2001) -> 0.0, vide -> None."""
+    if value is None or isinstance(value, (int, float)):
+        return None if value is None else float(value)
+    text = str(value).strip()
+    if text == "-":
+        return 0.0
+    try:
+        return float(text.replace(",", "."))
+    except ValueError:
+        return None
+
+
+def find_header(row):
+    """(colonne des régions, {colonne: année}) si ``row`` est la ligne d'en-tête, sinon None."""
+    for index, value in enumerate(row):
+        if isinstance(value, str) and _label(value).lower() == HEADER_LABEL:
+            years = {i: _year(cell) for i, cell in enumerate(row) if i > index and _year(cell)}
+            if years:
+                return index, years
+    return None
+
+
+def clean_rows(rows):
+    """Lignes de la feuille (itérateur de tuples) -> DataFrame nettoyé (Région + années)."""
+    header = None
+    records = []
+    for row in rows:
+        if header is None:
+            header = find_header(row)
+            continue
+        region_col, years = header
+        region = row[region_col] if region_col < len(row) else None
+        values = [_rate(row[i]) if i < len(row) else None for i in years]
+        # Sous-titre "Région", lignes vides, source en bas de tableau
+        if region is None or all(value is None for value in values):
+            continue
+        region = _label(region)
+        records.append([CORRECTIONS_REGIONS.get(region, region)] + values)
+
+    if header is None:
+        raise ValueError("ligne d'en-tête 'Année de naissance' introuvable")
+    df = pd.DataFrame(records, columns=["Région"] + list(header[1].values()))
+    return df.astype({year: "float64" for year in header[1].values()})
+
+
+def read_workbook(content):
+    """Nettoie la première feuille d'un classeur XLSX reçu en octets, sans passer par le disque."""
+    workbook = load_workbook(io.BytesIO(content), read_only=True, data_only=True)
+    try:
+        return clean_rows(workbook.worksheets[0].iter_rows(values_only=True))
+    finally:
+        workbook.close()
+
+
+def write_csv(df, path):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    df.to_csv(tmp_path, index=False, sep=";")
+    # Remplacement atomique : le dashboard peut relire le fichier à tout moment
+    os.replace(tmp_path, path)
+
+
+def find_links(session):
+    response = session.get(PAGE_URL, timeout=30)
+    response.raise_for_status()
     soup = BeautifulSoup(response.content, "html.parser")
-
-    # 🔍 Rechercher les liens contenant "2023" + "jeunes filles" ou "jeunes garçons"
-    links = soup.find_all("a", string=lambda text: text and ("2023" in text and ("jeunes filles" in text.lower() or "jeunes garçons" in text.lower())))
-
-    if links:
-        print(f"📂 {len(links)} fichiers trouvés.")
-
-        # 📥 Télécharger et convertir chaque fichier XLSX en CSV, puis supprimer le XLSX
-        for i, link in enumerate(links):
-            file_url = link.get("href")
-
-            # 🛠️ Vérifier si l'URL est relative et la compléter
-            if file_url.startswith("/"):
-                file_url = "https://www.santepubliquefrance.fr" + file_url  
-
-            # 🏷️ Définir les noms des fichiers avec leur chemin absolu
-            if "jeunes filles" in link.text.lower():
-                file_xlsx = os.path.join(save_folder, "couverture_vaccinale_2023_filles.xlsx")
-                file_csv = os.path.join(save_folder, "couverture_vaccinale_2023_filles.csv")
-            elif "jeunes garçons" in link.text.lower():
-                file_xlsx = os.path.join(save_folder, "couverture_vaccinale_2023_garcons.xlsx")
-                file_csv = os.path.join(save_folder, "couverture_vaccinale_2023_garcons.csv")
-            else:
-                file_xlsx = os.path.join(save_folder, f"fichier_{i + 1}.xlsx")
-                file_csv = os.path.join(save_folder, f"fichier_{i + 1}.csv")
-
-            # 📥 Télécharger le fichier XLSX
-            file_response = requests.get(file_url)
-            if file_response.status_code == 200:
-                with open(file_xlsx, "wb") as file:
-                    file.write(file_response.content)
-                print(f"✅ Fichier XLSX téléchargé : {file_xlsx}")
-
-                # 🔄 Convertir en CSV
-                try:
-                    df = pd.read_excel(file_xlsx, engine="openpyxl")  # Lire le fichier XLSX
-                    df.to_csv(file_csv, index=False, sep=";")  # Sauvegarder en CSV
-                    print(f"✅ Fichier converti en CSV : {file_csv}")
-
-                    # 🗑️ Supprimer le fichier XLSX après conversion
-                    os.remove(file_xlsx)
-                    print(f"🗑️ Fichier XLSX supprimé : {file_xlsx}")
-
-                except Exception as e:
-                    print(f"❌ Erreur de conversion {file_xlsx} -> CSV : {e}")
-
-            else:
-                print(f"❌ Erreur lors du téléchargement du fichier {i + 1} : {file_response.status_code}")
-
-    else:
+    links = {}
+    for link in soup.find_all("a", href=True):
+        text = link.get_text(" ", strip=True).lower()
+        for label, sexe in SEXES.items():
+            if YEAR in text and label in text:
+                href = link["href"]
+                links[sexe] = BASE_URL + href if href.startswith("/") else href
+    return links
+
+
+def main():
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    session = requests.Session()
+    links = find_links(session)
+    if not links:
         print("⚠️ Aucun fichier correspondant trouvé.")
-else:
-    print(f"❌ Erreur lors du téléchargement de la page : {response.status_code}")
+        return 1
+
+    for sexe, file_url in links.items():
+        response = session.get(file_url, timeout=60)
+        response.raise_for_status()
+        df = read_workbook(response.content)
+        path = os.path.join(OUTPUT_DIR, f"6_couverture_vaccinale_{YEAR}_{sexe}_nettoye.csv")
+        write_csv(df, path)
+        print(f"✅ {sexe} : {len(df)} régions, années {', '.join(df.columns[1:])} -> {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,92 @@
+"""Analyse hors ligne d'une page GCO enregistrée (``scraping_code/2_scrap_cancers/fixtures/``).
+
+    python -m pytest tests/test_gco_parse.py
+"""
+import importlib.util
+import os
+import urllib.error
+import urllib.request
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("selenium")
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT_DIR = os.path.join(ROOT_DIR, "scraping_code", "2_scrap_cancers")
+FIXTURES_DIR = os.path.join(SCRIPT_DIR, "fixtures")
+
+HEADERS = ["Population", "Population code (ISO/UN)", "Number", "ASR (World)", "Crude Rate", "Cum. risk 74"]
+
+
+@pytest.fixture(scope="module")
+def gco():
+    # Le nom du script commence par un chiffre : import par son chemin
+    spec = importlib.util.spec_from_file_location("scrap_gco", os.path.join(SCRIPT_DIR, "2_scrap_gco.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="module")
+def page(gco):
+    with open(os.path.join(FIXTURES_DIR, gco.fixture_name("anus", "incidence")), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_html_parser(gco, page):
+    headers, rows = gco.parse_table_html(page, use_lxml=False)
+    assert headers == HEADERS
+    # Seul le premier tableau est lu (pas celui du pied de page)
+    assert len(rows) == 7
+    assert rows[0] == ["Afghanistan", "004", "110", "0.47", "0.27", "0.06"]
+    # Espaces insécables regroupés comme dans le texte affiché
+    assert rows[2] == ["Brazil", "076", "3 138", "1.1", "1.5", "0.12"]
+    assert rows[-1] == ["Total", "", "54 306", "0.54", "0.69", "0.06"]
+
+
+def test_lxml_matches_html_parser(gco, page):
+    pytest.importorskip("lxml")
+    assert gco.parse_table_html(page, use_lxml=True) == gco.parse_table_html(page, use_lxml=False)
+
+
+def test_outer_html_of_table_alone(gco, page):
+    # read_table reçoit l'outerHTML du tableau, pas la page entière
+    table = page[page.index("<table>"):page.index("</table>") + len("</table>")]
+    for use_lxml in (False, gco.HAS_LXML):
+        assert gco.parse_table_html(table, use_lxml=use_lxml) == gco.parse_table_html(page, use_lxml=False)
+
+
+def test_typed_frame(gco, page):
+    df = gco.typed_frame(*gco.parse_table_html(page, use_lxml=False))
+    assert list(df.columns) == HEADERS
+    assert df["Number"].dtype == "Int64"
+    for col in ("ASR (World)", "Crude Rate", "Cum. risk 74"):
+        assert df[col].dtype == "float64"
+    # Codes ISO gardés en texte, zéros en tête compris
+    assert df["Population code (ISO/UN)"].tolist()[:3] == ["004", "008", "076"]
+    assert df.loc[df["Population"] == "Brazil", "Number"].item() == 3138
+    assert df.loc[df["Population"] == "Total", "Number"].item() == 54306
+
+
+def test_typed_frame_matches_csv(gco, page):
+    # Mêmes valeurs que le CSV de data/2_cancers/ une fois relu
+    df = gco.typed_frame(*gco.parse_table_html(page, use_lxml=False))
+    expected = pd.read_csv(os.path.join(ROOT_DIR, "data", "2_cancers", "2_anus_incidence.csv"),
+                           dtype={"Population code (ISO/UN)": str}, keep_default_na=False)
+    expected = expected[expected["Population"].isin(df["Population"])].reset_index(drop=True)
+    expected["Number"] = expected["Number"].str.replace(" ", "").astype("Int64")
+    pd.testing.assert_frame_equal(df, expected)
+
+
+def test_fixture_server(gco, page):
+    server, base_url = gco.serve_fixtures(FIXTURES_DIR)
+    try:
+        with urllib.request.urlopen(gco.table_url(base_url, "anus", "incidence"), timeout=10) as response:
+            assert response.read().decode("utf-8") == page
+        # Page non enregistrée
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            urllib.request.urlopen(gco.table_url(base_url, "col", "mortalite"), timeout=10)
+        assert excinfo.value.code == 404
+    finally:
+        server.shutdown()
@@ -0,0 +1,64 @@
+"""``dashboard.hpv.prepare_hpv_data`` contre l'ancienne boucle année par année.
+
+    python -m pytest tests/test_prepare_hpv.py
+"""
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from dashboard.hpv import gapminder_iso_map, prepare_hpv_data  # noqa: E402
+
+HPV_CSV = os.path.join(ROOT_DIR, "data", "3_HPV_vaccine_data.csv")
+
+# Entity et Code sont catégoriels dans la nouvelle version : on compare les valeurs
+LABELS = {'Entity': object, 'Code': object}
+
+
+def legacy_prepare_hpv_data(df, iso_map):
+    all_countries = pd.DataFrame({
+        'Entity': list(iso_map.keys()),
+        'Code': list(iso_map.values())
+    })
+    years = df['Year'].unique()
+    complete_data = []
+
+    for year in years:
+        year_data = df[df['Year'] == year].copy()
+        merged = all_countries.merge(year_data, on=['Entity', 'Code'], how='left')
+        merged['Year'] = year
+        merged['_3_b_1__sh_acs_hpv'] = merged['_3_b_1__sh_acs_hpv'].fillna(0)
+        complete_data.append(merged)
+
+    return pd.concat(complete_data, ignore_index=True)
+
+
+def test_small_frame():
+    iso_map = {"France": "FRA", "Spain": "ESP", "Italy": "ITA"}
+    df = pd.DataFrame({
+        # Années dans le désordre, pays hors gapminder, code ne correspondant pas au nom
+        'Entity': ["Spain", "France", "World", "France", "Italy", "Spain"],
+        'Code': ["ESP", "FRA", "OWID_WRL", "FRA", "XXX", "ESP"],
+        'Year': [2020, 2020, 2020, 2018, 2018, 2019],
+        '_3_b_1__sh_acs_hpv': [81.0, 45.5, 15.0, 30.0, 70.0, None],
+    })
+    result = prepare_hpv_data(df, iso_map)
+    pd.testing.assert_frame_equal(result.astype(LABELS), legacy_prepare_hpv_data(df, iso_map))
+
+    # Chaque année contient tous les pays, dans l'ordre de iso_map, 0 sans donnée
+    assert result['Year'].tolist() == [2020] * 3 + [2018] * 3 + [2019] * 3
+    assert result['Entity'].tolist() == list(iso_map) * 3
+    assert result['_3_b_1__sh_acs_hpv'].tolist() == [45.5, 81.0, 0.0, 30.0, 0.0, 0.0, 0.0, 0.0, 0.0]
+    assert result['Entity'].dtype == 'category' and result['Code'].dtype == 'category'
+
+
+@pytest.mark.skipif(not os.path.exists(HPV_CSV), reason="data/3_HPV_vaccine_data.csv absent")
+def test_owid_data():
+    iso_map = gapminder_iso_map()
+    df = pd.read_csv(HPV_CSV, sep=";", skiprows=1)
+    pd.testing.assert_frame_equal(prepare_hpv_data(df, iso_map).astype(LABELS),
+                                  legacy_prepare_hpv_data(df, iso_map))